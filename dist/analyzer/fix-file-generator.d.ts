@@ -10,9 +10,10 @@ export declare class FixFileGenerator {
     private hasAPI;
     private contextDetector;
     constructor(projectPath: string, issues: Issue[], projectType: string, hasPayments: boolean, hasAuth: boolean, hasDatabase: boolean, hasAPI: boolean, contextDetector: ProjectContextDetector);
-    generateEnhancedFixFile(buckets: IssueBucket[]): void;
+    generateEnhancedFixFile(buckets: IssueBucket[], startedAt?: number): void;
     private getIssuesByRule;
     private loadPreviousState;
+    private writeJsonAtomic;
     private saveState;
 }
 //# sourceMappingURL=fix-file-generator.d.ts.map
\ No newline at end of file
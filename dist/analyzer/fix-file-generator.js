@@ -56,7 +56,7 @@ class FixFileGenerator {
         this.hasAPI = hasAPI;
         this.contextDetector = contextDetector;
     }
-    generateEnhancedFixFile(buckets) {
+    generateEnhancedFixFile(buckets, startedAt = Date.now()) {
         const outputDir = path.join(this.projectPath, '.observer');
         if (!fs.existsSync(outputDir)) {
             fs.mkdirSync(outputDir, { recursive: true });
@@ -115,7 +115,8 @@ class FixFileGenerator {
                 by_rule: this.getIssuesByRule(),
                 buckets_total: buckets.length,
                 fixed_since_last_run: fixedCount,
-                remaining_issues: totalIssues
+                remaining_issues: totalIssues,
+                generation_ms: Date.now() - startedAt // Read by validate-data.py performance budgets
             },
             // Context without step-by-step instructions
             context: {
@@ -150,13 +151,13 @@ class FixFileGenerator {
             // Continue without insights if Python fails
         }
         // Write the enhanced file to .observer
-        fs.writeFileSync(path.join(outputDir, 'FIX_THIS.json'), JSON.stringify(finalFixFile, null, 2));
+        this.writeJsonAtomic(path.join(outputDir, 'FIX_THIS.json'), finalFixFile);
         // Also save to src/contracts/fixes.json for new project structure
         const contractsDir = path.join(this.projectPath, 'src', 'contracts');
         if (!fs.existsSync(contractsDir)) {
             fs.mkdirSync(contractsDir, { recursive: true });
         }
-        fs.writeFileSync(path.join(contractsDir, 'fixes.json'), JSON.stringify(finalFixFile, null, 2));
+        this.writeJsonAtomic(path.join(contractsDir, 'fixes.json'), finalFixFile);
         // Save context.json with essential project info for AI
         const contextFile = {
             analyzed_at: new Date().toISOString(),
@@ -170,7 +171,7 @@ class FixFileGenerator {
             environment_vars: this.contextDetector.detectEnvVars(),
             build_commands: this.contextDetector.getBuildCommands()
         };
-        fs.writeFileSync(path.join(contractsDir, 'context.json'), JSON.stringify(contextFile, null, 2));
+        this.writeJsonAtomic(path.join(contractsDir, 'context.json'), contextFile);
         // Save current state for next run
         this.saveState({
             total_issues: totalIssues,
@@ -209,9 +210,21 @@ class FixFileGenerator {
         }
         return null;
     }
+    // Write to a temp file and rename into place so readers never see a half-written file
+    writeJsonAtomic(filePath, data) {
+        const tmpPath = `${filePath}.${process.pid}.tmp`;
+        try {
+            fs.writeFileSync(tmpPath, JSON.stringify(data, null, 2));
+            fs.renameSync(tmpPath, filePath);
+        }
+        catch (error) {
+            fs.rmSync(tmpPath, { force: true }); // Don't leave a stray temp file behind
+            throw error;
+        }
+    }
     saveState(state) {
         const statePath = path.join(this.projectPath, '.observer', 'analysis_state.json');
-        fs.writeFileSync(statePath, JSON.stringify(state, null, 2));
+        this.writeJsonAtomic(statePath, state);
     }
 }
 exports.FixFileGenerator = FixFileGenerator;
@@ -61,6 +61,7 @@ class SmartIssueAnalyzer {
     // Main entry point - Enhanced with bucket classification
     async analyze() {
         console.log('🔍 Starting enhanced smart issue analysis with bucket classification...');
+        const startedAt = Date.now();
         // 1. Detect project type and features
         this.detectProjectFeatures();
         // 2. Collect ALL issues from validator system + legacy checks
@@ -70,7 +71,7 @@ class SmartIssueAnalyzer {
         const buckets = classifier.organizeBuckets();
         // 4. Generate enhanced FIX_THIS.json with all issues visible
         this.fixFileGenerator = new fix_file_generator_1.FixFileGenerator(this.projectPath, this.issues, this.projectType, this.hasPayments, this.hasAuth, this.hasDatabase, this.hasAPI, this.contextDetector);
-        this.fixFileGenerator.generateEnhancedFixFile(buckets);
+        this.fixFileGenerator.generateEnhancedFixFile(buckets, startedAt);
         console.log(`✅ Enhanced analysis complete. All ${this.issues.length} issues organized by importance.`);
         console.log('📊 Bucket distribution:', buckets.map(b => `${b.name}: ${b.count}`).join(', '));
     }
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Affected-Only Scope for AI Observer
+Changed files from git plus everything that transitively imports them
+
+analyze-dependencies.py --affected writes .observer/affected.json; pattern
+insights (OBSERVER_AFFECTED_ONLY=1 or --affected) and validate-data.py
+--affected then limit themselves to issues in that set. The set records the
+HEAD it was computed at and is ignored once HEAD moves.
+"""
+
+import subprocess
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+from observer_artifacts import read_artifact, write_artifact
+from project_paths import relative_file
+
+AFFECTED_FILE = 'affected.json'
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+
+
+def changed_files(root, base: str = 'HEAD') -> List[str]:
+    """Files changed relative to base (committed, staged or unstaged) plus untracked files"""
+    root = str(root)
+    diff = subprocess.run(
+        # --no-renames lists a renamed file under its old path too, so importers of the old path count
+        ['git', '-C', root, 'diff', '--name-only', '--no-renames', '--relative', base],
+        capture_output=True, text=True, check=True
+    )
+    untracked = subprocess.run(
+        ['git', '-C', root, 'ls-files', '--others', '--exclude-standard'],
+        capture_output=True, text=True, check=True
+    )
+    files = diff.stdout.splitlines() + untracked.stdout.splitlines()
+    return sorted(set(f for f in files if f))
+
+
+def head_commit(root) -> Optional[str]:
+    """SHA of HEAD, or None outside a git checkout"""
+    try:
+        result = subprocess.run(
+            ['git', '-C', str(root), 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True
+        )
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return result.stdout.strip()
+
+
+def module_targets(file_path: str) -> List[str]:
+    """Extensionless module paths an import of file_path can name
+
+    src/lib/index.ts can be imported as src/lib/index or as src/lib.
+    """
+    path = Path(file_path)
+    if path.suffix in SOURCE_EXTENSIONS:
+        path = path.with_suffix('')
+    targets = [str(path)]
+    if path.name == 'index':
+        targets.append(str(path.parent))
+    return targets
+
+
+def transitive_dependents(changed: Iterable[str], reverse_deps: Mapping[str, Set[str]]) -> Set[str]:
+    """Changed files plus every file that imports them, directly or transitively"""
+    affected = set(changed)
+    queue = deque(affected)
+    while queue:
+        current = queue.popleft()
+        for dependent in reverse_deps.get(current, ()):
+            if dependent not in affected:
+                affected.add(dependent)
+                queue.append(dependent)
+    return affected
+
+
+def save_affected(observer_dir: Path, base: Optional[str], changed: List[str], affected: Set[str],
+                  head: Optional[str] = None):
+    write_artifact(Path(observer_dir) / AFFECTED_FILE, {
+        'base': base,
+        'head': head,
+        'changed_count': len(changed),
+        'affected_count': len(affected),
+        'changed': changed,
+        'affected': sorted(affected)
+    }, header_keys=['base', 'head', 'changed_count', 'affected_count'])
+
+
+def load_affected(observer_dir: Path) -> Optional[Set[str]]:
+    """The saved affected set, or None if none was recorded or it was computed at another HEAD"""
+    path = Path(observer_dir) / AFFECTED_FILE
+    if not path.exists():
+        return None
+    data = read_artifact(path)
+    current = head_commit(Path(observer_dir).parent)
+    if data.get('head') != current:
+        # stderr, because pattern-insights.py writes its JSON result to stdout
+        print(f"⚠️  Ignoring {path}: computed at {data.get('head') or 'unknown HEAD'}, now at {current}. "
+              f"Re-run analyze-dependencies.py --affected.", file=sys.stderr)
+        return None
+    return set(data.get('affected', []))
+
+
+def filter_fixes(fixes_data: Dict, affected: Set[str]) -> Dict:
+    """Copy of a FIX_THIS.json document keeping only issues in affected files"""
+    project_root = fixes_data.get('project')
+
+    def scope(buckets):
+        scoped = []
+        for bucket in buckets:
+            issues = [issue for issue in bucket.get('issues', [])
+                      if relative_file(issue.get('file', ''), project_root) in affected]
+            scoped.append(dict(bucket, issues=issues, count=len(issues)))
+        return scoped
+
+    filtered = dict(fixes_data)
+    if fixes_data.get('issue_buckets'):
+        filtered['issue_buckets'] = scope(fixes_data['issue_buckets'])
+    elif (fixes_data.get('analysis') or {}).get('issue_buckets'):
+        filtered['analysis'] = dict(fixes_data['analysis'], issue_buckets=scope(fixes_data['analysis']['issue_buckets']))
+    return filtered
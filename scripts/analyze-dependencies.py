@@ -4,44 +4,84 @@ Dependency Analyzer for AI Observer
 Identifies which files are actually being used vs unused/redundant
 """
 
+import argparse
+import hashlib
 import os
 import re
 import json
+import sqlite3
+import time
 from pathlib import Path
 from collections import defaultdict
 import subprocess
+import sys
+
+from affected_files import changed_files, head_commit, module_targets, save_affected, transitive_dependents
+from duplicate_detector import DuplicateDetector, duplicates_report
+from history_store import HistoryStore
+from observer_artifacts import write_artifact
+from observer_trace import Tracer
+
+tracer = Tracer.from_env('analyze-dependencies')
 
 class DependencyAnalyzer:
     def __init__(self, root_path):
-        self.root = Path(root_path)
+        # Resolved, so relative --root values match the resolved import paths
+        self.root = Path(root_path).resolve()
         self.dependencies = defaultdict(set)
         self.reverse_deps = defaultdict(set)
+        self.unresolved_imports = defaultdict(set)  # module path (no extension) -> importing files
         self.entry_points = set()
         self.all_files = set()
         self.used_files = set()
         self.component_map = {}
+        self.started = time.perf_counter()
         
     def analyze(self):
         """Main analysis function"""
         print("🔍 Analyzing AI Observer dependencies...")
+        self.started = time.perf_counter()
         
-        # 1. Find all source files
-        self.find_all_files()
-        
-        # 2. Identify entry points
-        self.find_entry_points()
-        
-        # 3. Trace dependencies
-        self.trace_dependencies()
-        
-        # 4. Find dashboard components
-        self.find_dashboard_components()
-        
-        # 5. Calculate usage
-        self.calculate_usage()
+        with tracer.span('analyze'):
+            # 1. Find all source files
+            with tracer.span('find_all_files'):
+                self.find_all_files()
+            
+            # 2. Identify entry points
+            with tracer.span('find_entry_points'):
+                self.find_entry_points()
+            
+            # 3. Trace dependencies
+            with tracer.span('trace_dependencies'):
+                self.trace_dependencies()
+            
+            # 4. Find dashboard components
+            with tracer.span('find_dashboard_components'):
+                self.find_dashboard_components()
+            
+            # 5. Calculate usage
+            with tracer.span('calculate_usage'):
+                self.calculate_usage()
+            
+            # 6. Generate report
+            with tracer.span('generate_report'):
+                return self.generate_report()
+    
+    def analyze_affected(self, changed):
+        """Changed files plus everything that transitively imports them
         
-        # 6. Generate report
-        return self.generate_report()
+        Only the import graph is needed, so entry points, dashboard
+        components and usage are skipped.
+        """
+        with tracer.span('analyze_affected', changed=len(changed)):
+            with tracer.span('find_all_files'):
+                self.find_all_files()
+            with tracer.span('trace_dependencies'):
+                self.trace_dependencies()
+            with tracer.span('link_deleted'):
+                self.link_deleted(changed)
+            with tracer.span('transitive_dependents'):
+                return transitive_dependents(changed, self.reverse_deps)
     
     def find_all_files(self):
         """Find all TypeScript/JavaScript files"""
@@ -117,13 +157,18 @@ class DependencyAnalyzer:
                     if resolved:
                         self.dependencies[file_path].add(resolved)
                         self.reverse_deps[resolved].add(file_path)
+                    else:
+                        target = self.import_target(file_path, imp)
+                        if target:
+                            self.unresolved_imports[target].add(file_path)
     
     def resolve_import(self, from_file, import_path):
         """Resolve relative import to actual file"""
         from_dir = Path(from_file).parent
         
-        # Clean up the import path
-        import_path = import_path.replace('./', '').replace('../', '../')
+        # Clean up the import path ('../' segments are left for resolve())
+        if import_path.startswith('./'):
+            import_path = import_path[2:]
         
         # Try different extensions
         for ext in ['', '.ts', '.js', '.tsx', '.jsx', '/index.ts', '/index.js']:
@@ -137,6 +182,26 @@ class DependencyAnalyzer:
         
         return None
     
+    def import_target(self, from_file, import_path):
+        """Project-relative module path of an import that did not resolve"""
+        potential = (self.root / Path(from_file).parent / import_path).resolve()
+        try:
+            return module_targets(str(potential.relative_to(self.root)))[0]
+        except ValueError:
+            return None
+    
+    def link_deleted(self, changed):
+        """Link deleted or renamed-away files to the files that still import them
+        
+        A deleted module is no longer in all_files, so imports of it never
+        resolve; match the dangling import targets against its path instead.
+        """
+        for file_path in changed:
+            if file_path in self.all_files:
+                continue
+            for target in module_targets(file_path):
+                self.reverse_deps[file_path].update(self.unresolved_imports.get(target, ()))
+    
     def find_dashboard_components(self):
         """Find dashboard components and their usage"""
         dashboard_dir = self.root / 'src/dashboard'
@@ -191,7 +256,8 @@ class DependencyAnalyzer:
                 'total_files': len(self.all_files),
                 'used_files': len(self.used_files),
                 'unused_files': len(unused_files),
-                'usage_percentage': round((len(self.used_files) / len(self.all_files)) * 100, 2) if self.all_files else 0
+                'usage_percentage': round((len(self.used_files) / len(self.all_files)) * 100, 2) if self.all_files else 0,
+                'duration_ms': round((time.perf_counter() - self.started) * 1000, 2)
             },
             'entry_points': sorted(list(self.entry_points)),
             'core_flows': self.identify_core_flows(),
@@ -230,6 +296,93 @@ class DependencyAnalyzer:
         
         return flows
     
+    def graph_node(self, file_path, within=None):
+        """One file's usage and edges, optionally restricted to a set of files"""
+        imports = self.dependencies.get(file_path, set())
+        imported_by = self.reverse_deps.get(file_path, set())
+        if within is not None:
+            imports = imports & within
+            imported_by = imported_by & within
+        return {
+            'used': file_path in self.used_files,
+            'imports': sorted(imports),
+            'imported_by': sorted(imported_by)
+        }
+    
+    def graph_slices(self):
+        """Split the dependency graph into per-directory and per-entry-point slices"""
+        slices = []
+        
+        # One slice per directory: its files plus edges to neighbours anywhere
+        by_dir = defaultdict(list)
+        for file_path in self.all_files:
+            by_dir[str(Path(file_path).parent)].append(file_path)
+        for dir_name, files in sorted(by_dir.items()):
+            members = set(files)
+            nodes = {f: self.graph_node(f) for f in sorted(files)}
+            neighbours = set()
+            for node in nodes.values():
+                neighbours.update(node['imports'], node['imported_by'])
+            slices.append(('directory', dir_name, {
+                'files': nodes,
+                'external': sorted(neighbours - members)
+            }))
+        
+        # One slice per entry point: everything it transitively imports
+        flows = {info['entry']: (name, info['purpose']) for name, info in self.identify_core_flows().items()}
+        for entry in sorted(self.entry_points | set(flows)):
+            if entry not in self.all_files and entry not in self.dependencies:
+                continue
+            reachable = {entry}
+            to_process = [entry]
+            while to_process:
+                for dep in self.dependencies.get(to_process.pop(), ()):
+                    if dep not in reachable:
+                        reachable.add(dep)
+                        to_process.append(dep)
+            flow_name, purpose = flows.get(entry, (None, None))
+            slices.append(('entry', entry, {
+                'flow': flow_name,
+                'purpose': purpose,
+                'files': {f: self.graph_node(f, within=reachable) for f in sorted(reachable)}
+            }))
+        
+        return slices
+    
+    def write_graph_shards(self, out_dir, summary):
+        """Write graph slices plus a small manifest the dashboard can load first"""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        
+        manifest_slices = []
+        written = set()
+        for kind, slice_id, body in self.graph_slices():
+            digest = hashlib.sha1(slice_id.encode('utf-8')).hexdigest()[:8]
+            slug = re.sub(r'[^\w.]+', '-', slice_id).strip('-')
+            filename = f"{kind}--{slug}-{digest}.json"
+            nodes = body['files']
+            counts = {
+                'files': len(nodes),
+                'unused': sum(1 for node in nodes.values() if not node['used']),
+                'edges': sum(len(node['imports']) for node in nodes.values())
+            }
+            write_artifact(out_dir / filename, dict({'id': slice_id, 'kind': kind, 'counts': counts}, **body),
+                           header_keys=['id', 'kind', 'counts'])
+            manifest_slices.append(dict({'id': slice_id, 'kind': kind, 'file': filename}, **counts))
+            written.add(filename)
+        
+        # Drop slices for directories/entry points that no longer exist
+        for stale in out_dir.glob('*--*.json'):
+            if stale.name not in written:
+                stale.unlink()
+        
+        manifest = {
+            'summary': dict(summary, edges=sum(len(deps) for deps in self.dependencies.values())),
+            'slices': manifest_slices
+        }
+        write_artifact(out_dir / 'manifest.json', manifest, header_keys=['summary'])
+        return manifest
+    
     def generate_recommendations(self, unused_files):
         """Generate cleanup recommendations"""
         recommendations = []
@@ -258,16 +411,98 @@ class DependencyAnalyzer:
         return recommendations
 
 
+def project_files(root, paths):
+    """--changed paths as typed (cwd-relative or absolute) -> root-relative, as git diff lists them"""
+    relative = []
+    for path in paths:
+        # resolve() is non-strict, so deleted files still map onto the tree
+        try:
+            relative.append(Path(path).resolve().relative_to(root).as_posix())
+        except ValueError:
+            print(f"❌ --changed {path} is outside the project root {root}", file=sys.stderr)
+            sys.exit(1)
+    return relative
+
+
+def affected_main(analyzer, base, changed):
+    """Write .observer/affected.json for affected-only insights and validation"""
+    from_git = changed is None
+    if from_git:
+        try:
+            changed = changed_files(analyzer.root, base)
+        except (subprocess.CalledProcessError, OSError) as e:
+            detail = ((getattr(e, 'stderr', None) or str(e)).strip().splitlines() or [''])[0]
+            print(f"❌ Could not list changed files against '{base}' in {analyzer.root}: {detail}", file=sys.stderr)
+            print("   Use a git checkout and a valid --base ref, or pass --changed FILE...", file=sys.stderr)
+            sys.exit(1)
+    else:
+        changed = project_files(analyzer.root, changed)
+    affected = analyzer.analyze_affected(changed)
+    
+    observer_dir = analyzer.root / '.observer'
+    observer_dir.mkdir(exist_ok=True)
+    save_affected(observer_dir, base if from_git else None, changed, affected, head_commit(analyzer.root))
+    
+    print(f"\n🎯 {len(changed)} changed files affect {len(affected)} files")
+    for file in sorted(affected)[:10]:
+        print(f"  • {file}")
+    print(f"\n📁 Affected set saved to: {observer_dir / 'affected.json'}")
+    tracer.finish()
+
+
 def main():
-    analyzer = DependencyAnalyzer('/Users/rajatdhanda/Tech/Projects/ai-observer')
+    parser = argparse.ArgumentParser(description='Find used vs unused files in AI Observer')
+    parser.add_argument('--root', default='/Users/rajatdhanda/Tech/Projects/ai-observer', help='project root')
+    parser.add_argument('--affected', action='store_true',
+                        help='only compute the files affected by a change (writes .observer/affected.json)')
+    parser.add_argument('--base', default='HEAD', help='git ref to diff against in --affected mode')
+    parser.add_argument('--changed', nargs='+', help='explicit changed files instead of git diff (absolute or relative to the cwd)')
+    args = parser.parse_args()
+    
+    started = time.perf_counter()
+    analyzer = DependencyAnalyzer(args.root)
+    if args.affected:
+        affected_main(analyzer, args.base, args.changed)
+        return
+    
     report = analyzer.analyze()
     
     # Save report
-    output_path = Path('/Users/rajatdhanda/Tech/Projects/ai-observer/.observer/dependency-analysis.json')
+    output_path = analyzer.root / '.observer' / 'dependency-analysis.json'
     output_path.parent.mkdir(exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        json.dump(report, f, indent=2)
+    with tracer.span('write_report'):
+        write_artifact(output_path, report, header_keys=['summary'])
+    
+    # Sharded graph for the dashboard: manifest plus one slice per directory / entry point
+    with tracer.span('write_graph_shards'):
+        manifest = analyzer.write_graph_shards(analyzer.root / '.observer' / 'dependency-graph', report['summary'])
+    
+    # Near-duplicate code across the same src/** files, for the AI drift checks
+    with tracer.span('detect_duplicates'):
+        detector = DuplicateDetector(analyzer.root)
+        detector.add_files(analyzer.all_files)
+        duplicates = duplicates_report(detector.regions())
+        write_artifact(analyzer.root / '.observer' / 'duplicates.json', duplicates,
+                       header_keys=['generated', 'stats'])
+    
+    # Append to the run history for trend queries
+    with tracer.span('record_history'):
+        try:
+            store = HistoryStore.for_project(analyzer.root)
+            try:
+                store.record_usage(analyzer.all_files, analyzer.used_files)
+            finally:
+                store.close()
+        except sqlite3.Error:
+            pass  # History is best effort - never block the dependency report
+    
+    # Whole-run cost, written last so it covers every phase above (read by validate-data.py budgets)
+    timing_path = analyzer.root / '.observer' / 'dependency-timing.json'
+    write_artifact(timing_path, {
+        'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        'analysis_ms': report['summary']['duration_ms']
+    })
     
     # Print summary
     print("\n📊 Dependency Analysis Complete!")
@@ -275,6 +510,8 @@ def main():
     print(f"Total Files: {report['summary']['total_files']}")
     print(f"Used Files: {report['summary']['used_files']} ({report['summary']['usage_percentage']}%)")
     print(f"Unused Files: {report['summary']['unused_files']}")
+    print(f"Duplicate Blocks: {duplicates['stats']['total_issues_found']}")
+    print(f"Graph Slices: {len(manifest['slices'])}")
     print("\n🎯 Core Flows:")
     for flow_name, flow_info in report['core_flows'].items():
         print(f"  • {flow_name}: {flow_info['purpose']}")
@@ -282,6 +519,7 @@ def main():
     for rec in report['recommendations'][:3]:
         print(f"  • {rec}")
     print(f"\n📁 Full report saved to: {output_path}")
+    tracer.finish()
     
 
 if __name__ == '__main__':
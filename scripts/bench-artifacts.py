@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Artifact Format Benchmark for AI Observer
+Compares the legacy pretty-printed writes with observer_artifacts formats
+
+Usage: python3 bench-artifacts.py [artifact.json] [header_key] [repeats]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from observer_artifacts import read_artifact, read_header, write_artifact
+
+
+def timed(func, repeats):
+    """Best-of-N wall time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    source = Path(sys.argv[1] if len(sys.argv) > 1 else '.observer/analysis.json')
+    with open(source) as f:
+        data = json.load(f)
+    header_key = sys.argv[2] if len(sys.argv) > 2 else next(iter(data))
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / 'legacy.json'
+        compact = Path(tmp) / 'compact.json'
+        gzipped = Path(tmp) / 'gzipped.json'
+
+        def write_legacy():
+            with open(legacy, 'w') as f:
+                json.dump(data, f, indent=2)
+
+        def read_legacy():
+            with open(legacy) as f:
+                json.load(f)
+
+        rows = [
+            ('legacy indent=2', legacy, timed(write_legacy, repeats), read_legacy),
+            ('compact atomic', compact,
+             timed(lambda: write_artifact(compact, data, [header_key], gzip_sidecar=False), repeats),
+             lambda: read_artifact(compact)),
+            ('compact + gzip sidecar', gzipped,
+             timed(lambda: write_artifact(gzipped, data, [header_key], gzip_sidecar=True), repeats),
+             None)
+        ]
+
+        print(f"📦 {source} ({len(data)} top-level keys, header: '{header_key}', best of {repeats})")
+        print(f"{'format':<24}  {'bytes':>10}  {'write ms':>9}  {'read ms':>9}  {'header ms':>9}")
+        for name, path, write_ms, reader in rows:
+            if reader is None:
+                # Read through the sidecar: hide the plain file so the .gz is used
+                sidecar_only = path.with_name('sidecar-only.json')
+                path.with_name(path.name + '.gz').rename(sidecar_only.with_name(sidecar_only.name + '.gz'))
+                path = sidecar_only
+                size = path.with_name(path.name + '.gz').stat().st_size
+                reader = lambda: read_artifact(sidecar_only)
+            else:
+                size = path.stat().st_size
+            read_ms = timed(reader, repeats)
+            header_ms = timed(lambda: read_header(path, [header_key]), repeats)
+            print(f"{name:<24}  {size:>10}  {write_ms:>9.2f}  {read_ms:>9.2f}  {header_ms:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Duplicate Code Detector for AI Observer
+Finds copy-pasted blocks (even with renamed identifiers) using winnowing
+
+Tokens are normalized (identifiers -> I, strings -> S, numbers -> N), hashed
+as rolling k-grams, and winnowed to a sparse fingerprint set. Shared
+fingerprints between two places are merged into blocks, so the whole pass is
+roughly linear in the size of the source. Overlapping blocks are then grouped
+into regions, so code pasted N times is reported once with all N copies.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+KGRAM = 25           # tokens per hashed k-gram
+WINDOW = 8           # winnowing window (guarantees matches of KGRAM + WINDOW - 1 tokens are found)
+MIN_TOKENS = 80      # shortest block worth reporting
+MAX_OCCURRENCES = 8  # fingerprints shared by more places than this are boilerplate
+
+_BASE = 1000003
+_MOD = (1 << 61) - 1
+
+_TOKEN = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>`(?:[^`\\]|\\.)*`|"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<number>\b\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?\b)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<punct>=>|===|!==|==|!=|<=|>=|&&|\|\||\?\?|\?\.|\.\.\.|[{}()\[\];,.<>+\-*/%=!?:&|^~])
+  | (?P<newline>\n)
+''', re.VERBOSE | re.DOTALL)
+
+KEYWORDS = frozenset('''
+    async await break case catch class const continue default delete do else export extends
+    false finally for from function if import in instanceof interface let new null return
+    static super switch this throw true try type typeof undefined var void while yield
+'''.split())
+
+
+def tokenize(source: str) -> Tuple[List[str], List[int]]:
+    """Normalized tokens and the 1-based line of each token"""
+    tokens = []
+    lines = []
+    line = 1
+    for match in _TOKEN.finditer(source):
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'newline':
+            line += 1
+            continue
+        if kind == 'comment':
+            line += text.count('\n')
+            continue
+        if kind == 'ident':
+            tokens.append(text if text in KEYWORDS else 'I')
+        elif kind == 'string':
+            tokens.append('S')
+        elif kind == 'number':
+            tokens.append('N')
+        else:
+            tokens.append(text)
+        lines.append(line)
+        if kind == 'string':
+            line += text.count('\n')
+    return tokens, lines
+
+
+def kgram_hashes(tokens: List[str], k: int = KGRAM) -> List[int]:
+    """Rabin-Karp rolling hash of every k-token window"""
+    if len(tokens) < k:
+        return []
+    ids = [zlib.crc32(token.encode('utf-8')) for token in tokens]
+    top = pow(_BASE, k - 1, _MOD)
+    h = 0
+    for value in ids[:k]:
+        h = (h * _BASE + value) % _MOD
+    hashes = [h]
+    for i in range(k, len(ids)):
+        h = ((h - ids[i - k] * top) * _BASE + ids[i]) % _MOD
+        hashes.append(h)
+    return hashes
+
+
+def winnow(hashes: List[int], window: int = WINDOW) -> List[Tuple[int, int]]:
+    """(hash, position) fingerprints: the rightmost minimum of each window"""
+    fingerprints = []
+    last = -1
+    for start in range(max(len(hashes) - window + 1, 1 if hashes else 0)):
+        chunk = hashes[start:start + window]
+        low = min(chunk)
+        pos = start + len(chunk) - 1 - chunk[::-1].index(low)
+        if pos != last:
+            fingerprints.append((low, pos))
+            last = pos
+    return fingerprints
+
+
+class DuplicateDetector:
+    """Hash index of winnowed fingerprints across a set of source files"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.index: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        self.lines: Dict[str, List[int]] = {}
+
+    def add_files(self, files: Iterable[str]):
+        for file_path in sorted(files):
+            full_path = self.root / file_path
+            if not full_path.exists():
+                continue
+            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                tokens, lines = tokenize(f.read())
+            self.lines[file_path] = lines
+            for h, pos in winnow(kgram_hashes(tokens)):
+                self.index[h].append((file_path, pos))
+
+    def matches(self) -> Dict[Tuple[str, str], List[Tuple[int, int]]]:
+        """Matched (pos_a, pos_b) k-gram starts for each pair of locations"""
+        pairs = defaultdict(list)
+        for locations in self.index.values():
+            if len(locations) < 2 or len(locations) > MAX_OCCURRENCES:
+                continue
+            for i, (file_a, pos_a) in enumerate(locations):
+                for file_b, pos_b in locations[i + 1:]:
+                    if file_a == file_b and abs(pos_a - pos_b) < KGRAM:
+                        continue  # Overlapping windows in one file, not a copy
+                    pairs[(file_a, file_b)].append((pos_a, pos_b))
+        return pairs
+
+    def pair_spans(self) -> List[Tuple[str, int, int, str, int, int]]:
+        """(file_a, start_a, end_a, file_b, start_b, end_b) token spans of each duplicate pair"""
+        found = []
+        for (file_a, file_b), positions in self.matches().items():
+            # Matches on the same diagonal (constant offset) that are close together form one block
+            by_offset = defaultdict(list)
+            for pos_a, pos_b in positions:
+                by_offset[pos_b - pos_a].append(pos_a)
+
+            for offset, starts in by_offset.items():
+                starts.sort()
+                block_start = prev = starts[0]
+                for pos in starts[1:] + [None]:
+                    if pos is not None and pos - prev <= KGRAM + WINDOW:
+                        prev = pos
+                        continue
+                    end = prev + KGRAM - 1
+                    # A block overlapping its own copy is repetitive structure, not a paste
+                    self_overlap = file_a == file_b and block_start + offset <= end
+                    if end - block_start + 1 >= MIN_TOKENS and not self_overlap:
+                        found.append((file_a, block_start, end, file_b, block_start + offset, end + offset))
+                    if pos is not None:
+                        block_start = prev = pos
+        return found
+
+    def regions(self) -> List[Dict]:
+        """Duplicated regions, each listing every copy once
+
+        Pair spans that mostly overlap in a file are the same copy seen
+        through different pairs (or as sub-blocks) and are merged; copies
+        linked by any pair are then grouped (union-find), so every pairing
+        of N copies collapses into a single region.
+        """
+        spans = self.pair_spans()
+        by_file = defaultdict(set)
+        for file_a, start_a, end_a, file_b, start_b, end_b in spans:
+            by_file[file_a].add((start_a, end_a))
+            by_file[file_b].add((start_b, end_b))
+
+        # Span -> index of its copy within the file
+        copies: Dict[str, List[List[int]]] = {}
+        copy_of: Dict[Tuple[str, int, int], Tuple[str, int]] = {}
+        for file_path, intervals in by_file.items():
+            merged = []
+            for start, end in sorted(intervals):
+                if merged:
+                    last = merged[-1]
+                    overlap = min(last[1], end) - start + 1
+                    # Adjacent repeats touch by a few tokens; only a mostly shared span is the same copy
+                    if overlap * 2 >= min(last[1] - last[0], end - start) + 1:
+                        last[1] = max(last[1], end)
+                        copy_of[(file_path, start, end)] = (file_path, len(merged) - 1)
+                        continue
+                merged.append([start, end])
+                copy_of[(file_path, start, end)] = (file_path, len(merged) - 1)
+            copies[file_path] = merged
+
+        parent: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+        def find(node):
+            while parent.get(node, node) != node:
+                node = parent[node]
+            return node
+
+        for file_a, start_a, end_a, file_b, start_b, end_b in spans:
+            root_a = find(copy_of[(file_a, start_a, end_a)])
+            root_b = find(copy_of[(file_b, start_b, end_b)])
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        groups = defaultdict(list)
+        for file_path, merged in copies.items():
+            for i in range(len(merged)):
+                groups[find((file_path, i))].append((file_path, i))
+
+        found = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue  # Both sides of every pair merged into one copy
+            region_copies = []
+            for file_path, i in sorted(members, key=lambda m: (m[0], copies[m[0]][m[1]][0])):
+                start, end = copies[file_path][i]
+                lines = self.lines[file_path]
+                region_copies.append({
+                    'file': file_path,
+                    'start_line': lines[start],
+                    'end_line': lines[end],
+                    'tokens': end - start + 1
+                })
+            found.append({'copies': region_copies, 'tokens': max(c['tokens'] for c in region_copies)})
+        return sorted(found, key=lambda r: (-r['tokens'], r['copies'][0]['file'], r['copies'][0]['start_line']))
+
+
+def duplicate_issues(regions: List[Dict]) -> List[Dict]:
+    """Duplicated regions as FIX_THIS.json issues, one per region at its first copy"""
+    issues = []
+    for region in regions:
+        first, others = region['copies'][0], region['copies'][1:]
+        locations = ', '.join(f"{c['file']}:{c['start_line']}-{c['end_line']}" for c in others)
+        issues.append({
+            'file': first['file'],
+            'line': first['start_line'],
+            'rule': 'Duplicate Functions',
+            'severity': 'warning',
+            'message': (f"Lines {first['start_line']}-{first['end_line']} duplicated in "
+                        f"{len(others)} other place{'s' if len(others) > 1 else ''}: {locations} "
+                        f"({region['tokens']} tokens, identifiers may be renamed)"),
+            'fix': 'AI might edit only one copy - extract the shared logic into one function',
+            'category': 'code_drift',
+            'copies': region['copies']
+        })
+    return issues
+
+
+def duplicates_report(regions: List[Dict]) -> Dict:
+    """Duplicate issues in the FIX_THIS.json bucket format"""
+    issues = duplicate_issues(regions)
+    return {
+        'generated': datetime.now().isoformat(),
+        'issue_buckets': [{
+            'name': 'STRUCTURAL',
+            'title': 'Important Architectural Issues',
+            'description': 'Issues that affect code organization, maintainability, and reliability',
+            'color': '#f59e0b',
+            'priority': 2,
+            'count': len(issues),
+            'issues': issues
+        }] if issues else [],
+        'stats': {'total_issues_found': len(issues)}
+    }
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+History Store for AI Observer
+Indexed SQLite history of pattern insights and dependency reports across runs
+
+Usage:
+  python3 history_store.py <project> file <path> [runs]
+  python3 history_store.py <project> rule <rule> [runs]
+  python3 history_store.py <project> dir <directory> [runs]
+  python3 history_store.py <project> dir-unused <directory> [runs]
+  python3 history_store.py <project> unused-since <path>
+"""
+
+import sqlite3
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from project_paths import relative_file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    tool TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS issue_counts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS file_usage (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_tool ON runs(tool, id);
+CREATE INDEX IF NOT EXISTS idx_issue_file ON issue_counts(file, run_id);
+CREATE INDEX IF NOT EXISTS idx_issue_rule ON issue_counts(rule, run_id);
+CREATE INDEX IF NOT EXISTS idx_issue_dir ON issue_counts(directory, run_id);
+CREATE INDEX IF NOT EXISTS idx_usage_file ON file_usage(file, run_id);
+CREATE INDEX IF NOT EXISTS idx_usage_dir ON file_usage(directory, run_id);
+"""
+
+INSIGHTS_TOOL = 'pattern-insights'
+DEPENDENCIES_TOOL = 'analyze-dependencies'
+
+
+def _directory(file_path: str) -> str:
+    parent = str(Path(file_path).parent)
+    return '' if parent == '.' else parent
+
+
+class HistoryStore:
+    """Append-only run history in .observer/history.db"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def for_project(cls, project_root) -> 'HistoryStore':
+        observer_dir = Path(project_root) / '.observer'
+        observer_dir.mkdir(exist_ok=True)
+        return cls(observer_dir / 'history.db')
+
+    def close(self):
+        self.conn.close()
+
+    def _start_run(self, tool: str) -> int:
+        cursor = self.conn.execute(
+            'INSERT INTO runs (tool, created_at) VALUES (?, ?)',
+            (tool, datetime.now().isoformat())
+        )
+        return cursor.lastrowid
+
+    def record_issues(self, issues: Iterable[Dict], project_root: Optional[str] = None) -> int:
+        """Append one insights run: issue counts per (file, rule), in one transaction"""
+        counts = Counter()
+        for issue in issues:
+            counts[(relative_file(issue.get('file', ''), project_root), issue.get('rule', ''))] += 1
+
+        with self.conn:
+            run_id = self._start_run(INSIGHTS_TOOL)
+            self.conn.executemany(
+                'INSERT INTO issue_counts (run_id, file, directory, rule, count) VALUES (?, ?, ?, ?, ?)',
+                [(run_id, file_path, _directory(file_path), rule, count)
+                 for (file_path, rule), count in counts.items()]
+            )
+        return run_id
+
+    def record_usage(self, all_files: Iterable[str], used_files: Iterable[str]) -> int:
+        """Append one dependency run: used/unused flag per file, in one transaction"""
+        used = set(used_files)
+        with self.conn:
+            run_id = self._start_run(DEPENDENCIES_TOOL)
+            self.conn.executemany(
+                'INSERT INTO file_usage (run_id, file, directory, used) VALUES (?, ?, ?, ?)',
+                [(run_id, file_path, _directory(file_path), int(file_path in used))
+                 for file_path in all_files]
+            )
+        return run_id
+
+    def _recent_runs(self, tool: str, runs: int) -> Tuple[int, List[Tuple[int, str]]]:
+        """Oldest run id in the window, plus (id, created_at) for every run in it"""
+        rows = self.conn.execute(
+            'SELECT id, created_at FROM runs WHERE tool = ? ORDER BY id DESC LIMIT ?',
+            (tool, runs)
+        ).fetchall()
+        rows.reverse()
+        return (rows[0][0] if rows else 0), rows
+
+    def _issue_trend(self, column: str, value: str, runs: int) -> List[Tuple[str, int]]:
+        first_run, window = self._recent_runs(INSIGHTS_TOOL, runs)
+        totals = dict(self.conn.execute(
+            f'SELECT run_id, SUM(count) FROM issue_counts WHERE {column} = ? AND run_id >= ? GROUP BY run_id',
+            (value, first_run)
+        ).fetchall())
+        # Runs where the file/rule had no issues report 0 rather than being skipped
+        return [(created_at, totals.get(run_id, 0)) for run_id, created_at in window]
+
+    def file_trend(self, file_path: str, runs: int = 200) -> List[Tuple[str, int]]:
+        """Issue count for one file over the last N insights runs"""
+        return self._issue_trend('file', file_path, runs)
+
+    def rule_trend(self, rule: str, runs: int = 200) -> List[Tuple[str, int]]:
+        """Issue count for one rule over the last N insights runs"""
+        return self._issue_trend('rule', rule, runs)
+
+    def directory_trend(self, directory: str, runs: int = 200) -> List[Tuple[str, int]]:
+        """Issue count for one directory (direct children) over the last N insights runs"""
+        return self._issue_trend('directory', directory, runs)
+
+    def hotspots(self, runs: int = 200, limit: int = 10) -> List[Tuple[str, int]]:
+        """Files with the most issues summed over the last N insights runs"""
+        first_run, _ = self._recent_runs(INSIGHTS_TOOL, runs)
+        return self.conn.execute(
+            'SELECT file, SUM(count) AS total FROM issue_counts WHERE run_id >= ? '
+            'GROUP BY file ORDER BY total DESC LIMIT ?',
+            (first_run, limit)
+        ).fetchall()
+
+    def unused_since(self, file_path: str) -> Optional[str]:
+        """When a currently-unused file last became unused, or None if it is used/unknown"""
+        rows = self.conn.execute(
+            'SELECT u.used, r.created_at FROM file_usage u JOIN runs r ON r.id = u.run_id '
+            'WHERE u.file = ? ORDER BY u.run_id DESC',
+            (file_path,)
+        )
+        since = None
+        for used, created_at in rows:
+            if used:
+                break
+            since = created_at
+        return since
+
+    def directory_unused_trend(self, directory: str, runs: int = 200) -> List[Tuple[str, int]]:
+        """Unused file count for one directory over the last N dependency runs"""
+        first_run, window = self._recent_runs(DEPENDENCIES_TOOL, runs)
+        totals = dict(self.conn.execute(
+            'SELECT run_id, SUM(1 - used) FROM file_usage WHERE directory = ? AND run_id >= ? GROUP BY run_id',
+            (directory, first_run)
+        ).fetchall())
+        return [(created_at, totals.get(run_id, 0)) for run_id, created_at in window]
+
+
+def main():
+    if len(sys.argv) < 4:
+        print(__doc__)
+        sys.exit(1)
+
+    project, command, target = sys.argv[1:4]
+    runs = int(sys.argv[4]) if len(sys.argv) > 4 else 200
+    store = HistoryStore.for_project(project)
+
+    if command == 'unused-since':
+        since = store.unused_since(target)
+        print(f"{target}: unused since {since}" if since else f"{target}: in use or not tracked")
+        return
+
+    trend = {
+        'file': store.file_trend,
+        'rule': store.rule_trend,
+        'dir': store.directory_trend,
+        'dir-unused': store.directory_unused_trend
+    }[command](target, runs)
+    for created_at, count in trend:
+        print(f"{created_at}  {count}")
+
+
+if __name__ == '__main__':
+    main()
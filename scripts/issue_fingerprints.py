@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Issue Fingerprint Index for AI Observer
+Stable hashes over normalized issues for deduplication and cross-run tracking
+"""
+
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from project_paths import relative_file
+
+# Quoted values and numbers vary between repeats of the same issue
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"|`[^`]*`")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def message_template(message: str) -> str:
+    """Normalize a message to its template: Entity 'User' ... -> Entity '*' ..."""
+    template = _QUOTED.sub("'*'", message)
+    template = _NUMBER.sub('#', template)
+    return ' '.join(template.split())
+
+
+def iter_issues(fixes_data: Dict) -> Iterable[Dict]:
+    """Yield issues from FIX_THIS.json / fixes.json (root or legacy analysis buckets)"""
+    buckets = fixes_data.get('issue_buckets') or (fixes_data.get('analysis') or {}).get('issue_buckets') or []
+    for bucket in buckets:
+        yield from bucket.get('issues', [])
+
+
+class FingerprintIndex:
+    """Hash-indexed store of issue fingerprints with occurrence counts"""
+
+    def __init__(self, project_root: Optional[str] = None):
+        self.project_root = project_root.rstrip('/') if project_root else None
+        self.entries: Dict[str, Dict] = {}
+        self.total = 0
+
+    @classmethod
+    def from_fixes(cls, fixes_data: Dict) -> 'FingerprintIndex':
+        """Build an index from a FIX_THIS.json / fixes.json document"""
+        index = cls(fixes_data.get('project'))
+        for issue in iter_issues(fixes_data):
+            index.add(issue)
+        return index
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FingerprintIndex':
+        """Rebuild an index saved with to_dict()"""
+        index = cls(data.get('project'))
+        index.entries = data.get('fingerprints', {})
+        index.total = sum(entry['count'] for entry in index.entries.values())
+        return index
+
+    def normalize_file(self, file_path: str) -> str:
+        return relative_file(file_path, self.project_root)
+
+    def fingerprint(self, issue: Dict) -> str:
+        """Stable hash over (file, rule, message template, line)"""
+        key = '\x1f'.join([
+            self.normalize_file(issue.get('file', '')),
+            issue.get('rule', ''),
+            message_template(issue.get('message', '')),
+            str(issue.get('line', 0))
+        ])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    def add(self, issue: Dict) -> bool:
+        """Add an issue; returns False if it repeats an existing fingerprint"""
+        fp = self.fingerprint(issue)
+        self.total += 1
+        entry = self.entries.get(fp)
+        if entry is not None:
+            entry['count'] += 1
+            return False
+        # Files, rules and templates repeat across issues; share one copy of each
+        self.entries[fp] = {
+            'file': sys.intern(self.normalize_file(issue.get('file', ''))),
+            'rule': sys.intern(issue.get('rule', '')),
+            'template': sys.intern(message_template(issue.get('message', ''))),
+            'line': issue.get('line', 0),
+            'severity': sys.intern(issue.get('severity', '')),
+            'count': 1
+        }
+        return True
+
+    def __contains__(self, fp: str) -> bool:
+        return fp in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def duplicates(self) -> int:
+        """Issues collapsed into an existing fingerprint"""
+        return self.total - len(self.entries)
+
+    def most_repeated(self, limit: int = 5) -> List[Dict]:
+        repeated = [entry for entry in self.entries.values() if entry['count'] > 1]
+        return sorted(repeated, key=lambda entry: -entry['count'])[:limit]
+
+    def diff(self, previous: 'FingerprintIndex') -> Dict[str, List[str]]:
+        """Classify fingerprints as new, fixed or persisting relative to a previous run"""
+        return {
+            'new': [fp for fp in self.entries if fp not in previous],
+            'fixed': [fp for fp in previous.entries if fp not in self],
+            'persisting': [fp for fp in self.entries if fp in previous]
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            'project': self.project_root,
+            'fingerprints': self.entries
+        }
+
+
+def load_index(path: Path) -> Optional[Dict]:
+    """Load a saved fingerprint store, or None if missing/corrupt"""
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return None
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON reader for AI Observer artifacts
+Walks JSON files in one incremental pass; memory held by the reader grows
+with nesting depth, not file size
+
+The pure-Python tokenizer is several times slower than the C json parser, so
+iter_file_events() parses files below STREAM_MIN_BYTES whole and walks them to
+produce the same events. That caps the parsed-document cost at a few MB worth
+of JSON; anything larger is streamed. Callers that keep per-item data still
+pay for it themselves.
+"""
+
+import json
+import os
+import re
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+STREAM_MIN_BYTES = 4 * 1024 * 1024
+
+_WHITESPACE = re.compile(r'\s*')
+_TOKEN = re.compile(r'''
+    (?P<punct>[{}\[\]:,])
+  | (?P<string>"[^"\\\x00-\x1f]*(?:\\.[^"\\\x00-\x1f]*)*")
+  | (?P<number>-?[0-9][0-9.eE+\-]*)
+  | (?P<literal>[a-z]+)
+''', re.VERBOSE)
+# Numbers and literals are matched greedily so a token cut at a chunk boundary
+# always touches the end of the buffer; they are validated once complete.
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_LITERALS = {'true': ('boolean', True), 'false': ('boolean', False), 'null': ('null', None)}
+
+# Event name -> schema type name
+EVENT_TYPES = {
+    'start_map': 'object',
+    'start_array': 'array',
+    'string': 'string',
+    'number': 'number',
+    'boolean': 'boolean',
+    'null': 'null'
+}
+
+
+class StreamError(ValueError):
+    """Raised when an artifact is not well-formed JSON"""
+
+
+def _iter_tokens(fp: IO[str], chunk_size: int) -> Iterator[Tuple[str, str]]:
+    """Yield (kind, text) tokens, reading the file a chunk at a time"""
+    buf = ''
+    pos = 0
+    eof = False
+
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        match = _TOKEN.match(buf, pos) if pos < len(buf) else None
+
+        # A token touching the end of the buffer may be cut off - read more first
+        if not eof and (match is None or match.end() == len(buf)):
+            chunk = fp.read(chunk_size)
+            if chunk:
+                buf = buf[pos:] + chunk
+                pos = 0
+            else:
+                eof = True
+            continue
+
+        if match is None:
+            if pos >= len(buf):
+                return
+            raise StreamError(f"Unexpected character {buf[pos]!r}")
+
+        pos = match.end()
+        kind = match.lastgroup
+        yield kind, match.group(kind)
+
+
+def _string(text: str) -> str:
+    if '\\' not in text:
+        return text[1:-1]  # No escapes to decode (control characters never match _TOKEN)
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise StreamError(f"Invalid string {text[:40]!r}: {e}") from None
+
+
+def iter_events(fp: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, object]]:
+    """Yield (event, value) pairs for a JSON document
+
+    Events: start_map, map_key, end_map, start_array, end_array,
+    string, number, boolean, null. Anything that is not a single
+    well-formed JSON document raises StreamError.
+    """
+    stack = []  # 'map' / 'array' for each open container
+    state = 'value'  # Next token must be: 'value', 'key', 'colon', 'next' (',' or close) or 'done'
+    may_close = False  # An empty container may close straight after it opens
+
+    for kind, text in _iter_tokens(fp, chunk_size):
+        if state == 'done':
+            raise StreamError(f"Extra data after document: {text!r}")
+
+        if kind == 'punct' and text in '}]' and (state == 'next' or may_close):
+            expected = 'map' if text == '}' else 'array'
+            if stack.pop() != expected:
+                raise StreamError(f"Unbalanced {text!r}")
+            may_close = False
+            state = 'next' if stack else 'done'
+            yield 'end_map' if text == '}' else 'end_array', None
+            continue
+        may_close = False
+
+        if state == 'key':
+            if kind != 'string':
+                raise StreamError(f"Expected object key, got {text!r}")
+            state = 'colon'
+            yield 'map_key', _string(text)
+        elif state == 'colon':
+            if text != ':':
+                raise StreamError(f"Expected ':', got {text!r}")
+            state = 'value'
+        elif state == 'next':
+            if text != ',':
+                raise StreamError(f"Expected ',' or closing bracket, got {text!r}")
+            state = 'key' if stack[-1] == 'map' else 'value'
+        elif kind == 'punct':
+            if text == '{':
+                stack.append('map')
+                state = 'key'
+            elif text == '[':
+                stack.append('array')
+                state = 'value'
+            else:
+                raise StreamError(f"Expected a value, got {text!r}")
+            may_close = True
+            yield 'start_map' if text == '{' else 'start_array', None
+        else:
+            if kind == 'string':
+                event = 'string', _string(text)
+            elif kind == 'number':
+                if not _NUMBER.fullmatch(text):
+                    raise StreamError(f"Invalid number {text!r}")
+                event = 'number', float(text) if any(c in text for c in '.eE') else int(text)
+            elif text in _LITERALS:
+                event = _LITERALS[text]
+            else:
+                raise StreamError(f"Invalid literal {text!r}")
+            state = 'next' if stack else 'done'
+            yield event
+
+    if state != 'done':
+        raise StreamError('Unexpected end of document')
+
+
+def iter_path_events(fp: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, str, object]]:
+    """Yield (prefix, event, value) triples, with ijson-style dotted prefixes
+
+    Array members use 'item', so every issue in FIX_THIS.json is reported
+    under 'issue_buckets.item.issues.item'.
+    """
+    # (container prefix, member prefix) per open container; maps name members by key
+    stack: List[Tuple[str, Optional[str]]] = []
+    prefix = ''  # Prefix of the next value
+
+    for event, value in iter_events(fp, chunk_size):
+        if event == 'map_key':
+            base = stack[-1][0]
+            yield base, event, value
+            prefix = f"{base}.{value}" if base else value
+        elif event == 'end_map' or event == 'end_array':
+            base = stack.pop()[0]
+            yield base, event, value
+            if stack and stack[-1][1] is not None:
+                prefix = stack[-1][1]
+        else:
+            yield prefix, event, value
+            if event == 'start_map':
+                stack.append((prefix, None))
+            elif event == 'start_array':
+                item = f"{prefix}.item" if prefix else 'item'
+                stack.append((prefix, item))
+                prefix = item
+
+
+def iter_object_events(obj: object, prefix: str = '') -> Iterator[Tuple[str, str, object]]:
+    """iter_path_events for an already-parsed document"""
+    if isinstance(obj, dict):
+        yield prefix, 'start_map', None
+        for key, value in obj.items():
+            yield prefix, 'map_key', key
+            yield from iter_object_events(value, f"{prefix}.{key}" if prefix else key)
+        yield prefix, 'end_map', None
+    elif isinstance(obj, list):
+        yield prefix, 'start_array', None
+        item_prefix = f"{prefix}.item" if prefix else 'item'
+        for value in obj:
+            yield from iter_object_events(value, item_prefix)
+        yield prefix, 'end_array', None
+    elif isinstance(obj, str):
+        yield prefix, 'string', obj
+    elif isinstance(obj, bool):
+        yield prefix, 'boolean', obj
+    elif obj is None:
+        yield prefix, 'null', None
+    else:
+        yield prefix, 'number', obj
+
+
+def _reject_constant(name: str):
+    raise StreamError(f"Invalid literal {name!r}")
+
+
+def iter_file_events(path, stream_min_bytes: int = STREAM_MIN_BYTES) -> Iterator[Tuple[str, str, object]]:
+    """iter_path_events for a file: streamed when large, parsed whole and walked otherwise"""
+    with open(path, encoding='utf-8') as f:
+        if os.path.getsize(path) >= stream_min_bytes:
+            yield from iter_path_events(f)
+            return
+        try:
+            document = json.load(f, parse_constant=_reject_constant)
+        except ValueError as e:
+            raise StreamError(str(e)) from None
+    yield from iter_object_events(document)
+
+
+class SchemaChecker:
+    """Checks objects at declared prefixes for required fields as events stream past
+
+    The schema maps a prefix to {field: type or tuple of types}, e.g.
+    {'issue_buckets.item': {'name': 'string', 'count': 'number'}}.
+    Only fields named in the schema are tracked, so memory grows with nesting
+    depth rather than document size. A value at a declared prefix that is not
+    an object is reported as a type error.
+    """
+
+    def __init__(self, schema: Dict[str, Dict], max_errors: int = 50):
+        self.schema = schema
+        self.max_errors = max_errors
+        self.errors: List[str] = []
+        self.error_count = 0
+        self.stack: List[Dict] = []
+
+    def error(self, message: str):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(message)
+
+    def feed(self, prefix: str, event: str, value: object):
+        """Consume one event from iter_path_events"""
+        if event == 'map_key':
+            self.stack[-1]['key'] = value
+            return
+
+        if event in ('end_map', 'end_array'):
+            frame = self.stack.pop()
+            fields = frame['fields']
+            if fields:
+                for field in fields:
+                    if field not in frame['seen']:
+                        self.error(f"{frame['location']}: missing '{field}'")
+            return
+
+        # Any other event is a value inside the current container
+        location = prefix
+        typed = False  # Already checked against the parent's declared field type
+        if self.stack:
+            parent = self.stack[-1]
+            if parent['kind'] == 'array':
+                location = f"{prefix} #{parent['index']}"
+                parent['index'] += 1
+            elif parent['fields'] and parent['key'] in parent['fields']:
+                expected = parent['fields'][parent['key']]
+                actual = EVENT_TYPES[event]
+                if actual not in (expected if isinstance(expected, tuple) else (expected,)):
+                    self.error(f"{parent['location']}: '{parent['key']}' is {actual}, expected {expected}")
+                parent['seen'].add(parent['key'])
+                typed = True
+
+        # Declared prefixes describe objects; anything else there is a type error
+        if prefix in self.schema and event != 'start_map' and not typed:
+            self.error(f"{location or '<root>'} is {EVENT_TYPES[event]}, expected object")
+
+        if event == 'start_map':
+            self.stack.append({
+                'kind': 'map',
+                'fields': self.schema.get(prefix),
+                'seen': set(),
+                'key': None,
+                'location': location or '<root>'
+            })
+        elif event == 'start_array':
+            self.stack.append({'kind': 'array', 'fields': None, 'index': 0, 'location': location})
+
+
+def _build(events: Iterator[Tuple[str, object]], event: str, value: object) -> object:
+    """Materialize one value from the event stream"""
+    if event == 'start_map':
+        obj = {}
+        for inner, key in events:
+            if inner == 'end_map':
+                return obj
+            obj[key] = _build(events, *next(events))
+        raise StreamError('Unexpected end of document')
+    if event == 'start_array':
+        items = []
+        for inner, item in events:
+            if inner == 'end_array':
+                return items
+            items.append(_build(events, inner, item))
+        raise StreamError('Unexpected end of document')
+    return value
+
+
+def _skip(events: Iterator[Tuple[str, object]], event: str):
+    """Consume one value from the event stream without building it"""
+    if event not in ('start_map', 'start_array'):
+        return
+    depth = 1
+    for inner, _ in events:
+        if inner in ('start_map', 'start_array'):
+            depth += 1
+        elif inner in ('end_map', 'end_array'):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def read_keys(fp: IO[str], keys: Iterable[str], chunk_size: int = 8 * 1024) -> Dict:
+    """Values of the requested top-level keys, stopping once all have been read
+
+    Cheap when the keys come first in the document (see observer_artifacts).
+    """
+    wanted = set(keys)
+    found = {}
+    events = iter_events(fp, chunk_size)
+    if next(events, (None, None))[0] != 'start_map':
+        return found
+
+    for event, key in events:
+        if event == 'end_map':
+            break
+        event, value = next(events)
+        if key in wanted:
+            found[key] = _build(events, event, value)
+            if len(found) == len(wanted):
+                break
+        else:
+            _skip(events, event)
+    return found
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Artifact Writer/Reader for AI Observer
+Atomic, compact JSON for .observer outputs with an optional gzip sidecar
+
+Writers never leave a half-written file: data goes to a temp file in the
+same directory and is renamed into place. Header keys are written first so
+read_header() can stop parsing as soon as it has them.
+
+Set OBSERVER_ARTIFACT_GZIP=1 to also write <artifact>.gz next to each file.
+"""
+
+import gzip
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from json_stream import read_keys
+
+
+def _file_mode(path: Path) -> int:
+    """Mode for a rewrite of path: keep an existing file's, else what open() would create"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)  # Only readable by setting it; restore straight away
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_bytes(path: Path, payload: bytes):
+    """Write to a temp file in the target directory, fsync, then rename over path"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), _file_mode(path))  # mkstemp creates 0600
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_artifact(path, data: Dict, header_keys: Iterable[str] = (),
+                   indent: Optional[int] = None, gzip_sidecar: Optional[bool] = None):
+    """Atomically write a JSON artifact (compact unless indent is given)"""
+    path = Path(path)
+    header_keys = [key for key in header_keys if key in data]
+    if header_keys:
+        ordered = {key: data[key] for key in header_keys}
+        ordered.update((key, value) for key, value in data.items() if key not in ordered)
+        data = ordered
+
+    if indent is None:
+        text = json.dumps(data, separators=(',', ':'))
+    else:
+        text = json.dumps(data, indent=indent)
+    payload = text.encode('utf-8')
+    atomic_write_bytes(path, payload)
+
+    if gzip_sidecar is None:
+        gzip_sidecar = os.environ.get('OBSERVER_ARTIFACT_GZIP') == '1'
+    sidecar = path.with_name(path.name + '.gz')
+    if gzip_sidecar:
+        atomic_write_bytes(sidecar, gzip.compress(payload, compresslevel=6, mtime=0))
+    elif sidecar.exists():
+        sidecar.unlink()  # A stale sidecar would disagree with the new artifact
+
+
+def _open_text(path: Path):
+    if path.exists():
+        return open(path, encoding='utf-8')
+    sidecar = path.with_name(path.name + '.gz')
+    if sidecar.exists():
+        return gzip.open(sidecar, 'rt', encoding='utf-8')
+    raise FileNotFoundError(str(path))
+
+
+def read_artifact(path) -> Dict:
+    """Load a whole artifact, falling back to its gzip sidecar"""
+    with _open_text(Path(path)) as f:
+        return json.load(f)
+
+
+def read_header(path, keys: Iterable[str]) -> Dict:
+    """Load only the given top-level keys, without parsing the rest of the payload"""
+    with _open_text(Path(path)) as f:
+        return read_keys(f, keys)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Phase timing and profiling hooks for AI Observer Python tools
+Records nested spans and exports them as Chrome trace-event JSON
+
+Enable with environment variables (all off by default):
+  OBSERVER_TRACE=<dir>        write <dir>/<tool>-trace.json and print a summary table
+  OBSERVER_TRACE_MEMORY=1     also record allocated bytes per span (tracemalloc)
+  OBSERVER_PROFILE=1          also dump cProfile stats to <dir>/<tool>.prof
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Shared no-op span so disabled tracing allocates nothing per call
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """A timing span; created only when tracing is enabled"""
+
+    __slots__ = ('tracer', 'name', 'args', 'start', 'child_time', 'mem_start')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.child_time = 0
+        self.mem_start = self.tracer.traced_memory()
+        self.tracer.stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        tracer = self.tracer
+        tracer.stack.pop()
+        duration = end - self.start
+        if tracer.stack:
+            tracer.stack[-1].child_time += duration
+
+        args = dict(self.args)
+        if self.mem_start is not None:
+            args['alloc_bytes'] = tracer.traced_memory() - self.mem_start
+        if exc_type is not None:
+            args['error'] = exc_type.__name__
+
+        tracer.events.append({
+            'name': self.name,
+            'cat': tracer.tool,
+            'ph': 'X',
+            'ts': (self.start - tracer.origin) / 1000,
+            'dur': duration / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args
+        })
+        tracer.self_time[self.name] = tracer.self_time.get(self.name, 0) + duration - self.child_time
+        return False
+
+
+class Tracer:
+    """Collects nested timing spans for one tool run"""
+
+    def __init__(self, tool: str, output_dir: Optional[str] = None,
+                 memory: bool = False, profile: bool = False):
+        self.tool = tool
+        self.enabled = output_dir is not None
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.memory = self.enabled and memory
+        self.events: List[Dict] = []
+        self.stack: List[_Span] = []
+        self.self_time: Dict[str, int] = {}
+        self.origin = time.perf_counter_ns()
+        self.profiler = None
+
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.enabled and profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    @classmethod
+    def from_env(cls, tool: str) -> 'Tracer':
+        """Build a tracer configured from OBSERVER_TRACE* environment variables"""
+        return cls(
+            tool,
+            output_dir=os.environ.get('OBSERVER_TRACE') or None,
+            memory=os.environ.get('OBSERVER_TRACE_MEMORY') == '1',
+            profile=os.environ.get('OBSERVER_PROFILE') == '1'
+        )
+
+    def span(self, name: str, **args):
+        """Context manager timing a block; a shared no-op when disabled"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def traced_memory(self) -> Optional[int]:
+        if not self.memory:
+            return None
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[0]
+
+    def take(self) -> Dict:
+        """Hand off the spans recorded so far (e.g. from a worker process) and reset"""
+        payload = {'origin': self.origin, 'events': self.events, 'self_time': self.self_time}
+        self.events = []
+        self.self_time = {}
+        return payload
+
+    def merge(self, payload: Dict):
+        """Add spans handed off by another tracer's take()
+
+        perf_counter_ns reads one system-wide monotonic clock on Linux and
+        macOS, so shifting by the difference in origins lines up timelines
+        recorded in different processes.
+        """
+        shift = (payload['origin'] - self.origin) / 1000
+        for event in payload['events']:
+            self.events.append(dict(event, ts=event['ts'] + shift))
+        for name, self_ns in payload['self_time'].items():
+            self.self_time[name] = self.self_time.get(name, 0) + self_ns
+
+    def chrome_trace(self) -> Dict:
+        """Trace in Chrome trace-event format (load in chrome://tracing or Perfetto)"""
+        return {
+            'traceEvents': sorted(self.events, key=lambda e: e['ts']),
+            'displayTimeUnit': 'ms',
+            'otherData': {'tool': self.tool}
+        }
+
+    def summary_table(self) -> str:
+        """Per-span call count, total and self time, slowest first"""
+        totals: Dict[str, List[float]] = {}
+        for event in self.events:
+            entry = totals.setdefault(event['name'], [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += event['dur'] / 1000
+            entry[2] += event['args'].get('alloc_bytes', 0)
+
+        width = max([len(name) for name in totals] + [4])
+        lines = [f"{'span':<{width}}  {'calls':>5}  {'total ms':>10}  {'self ms':>10}"
+                 + ('  {:>12}'.format('alloc bytes') if self.memory else '')]
+        for name, (calls, total_ms, alloc) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            line = f"{name:<{width}}  {calls:>5}  {total_ms:>10.2f}  {self.self_time[name] / 1e6:>10.2f}"
+            if self.memory:
+                line += f"  {alloc:>12}"
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def finish(self):
+        """Write the trace (and profile) and print the summary to stderr"""
+        if not self.enabled:
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        trace_path = self.output_dir / f'{self.tool}-trace.json'
+        with open(trace_path, 'w') as f:
+            json.dump(self.chrome_trace(), f, separators=(',', ':'))
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(str(self.output_dir / f'{self.tool}.prof'))
+        if self.memory:
+            import tracemalloc
+            tracemalloc.stop()
+
+        # stderr, because pattern-insights.py writes its JSON result to stdout
+        print(f"\n⏱️  {self.tool} timing (trace: {trace_path})", file=sys.stderr)
+        print(self.summary_table(), file=sys.stderr)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Project-Relative Paths for AI Observer
+One normalization for issue file paths, shared by fingerprints, affected-only
+scoping and the history store
+
+Analyzers report files as absolute paths under the project root, as ./-prefixed
+relative paths, or with Windows separators; all of them compare equal once
+normalized here.
+"""
+
+from typing import Optional
+
+
+def relative_file(file_path: str, project_root: Optional[str] = None) -> str:
+    """file_path relative to project_root, with forward slashes and no leading ./"""
+    file_path = file_path.replace('\\', '/')
+    if project_root:
+        prefix = project_root.replace('\\', '/').rstrip('/') + '/'
+        if file_path.startswith(prefix):
+            file_path = file_path[len(prefix):]
+    return file_path[2:] if file_path.startswith('./') else file_path
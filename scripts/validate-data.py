@@ -4,20 +4,78 @@ Data Validation Checklist for AI Observer
 Ensures data integrity and completeness across all analysis outputs
 """
 
+import argparse
 import json
 import os
 from pathlib import Path
 import subprocess
+import statistics
+import time
+from collections import Counter, deque
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from affected_files import filter_fixes, load_affected
+from issue_fingerprints import FingerprintIndex, load_index
+from json_stream import SchemaChecker, StreamError, iter_file_events
+from observer_artifacts import atomic_write_bytes, read_artifact, read_header, write_artifact
+from observer_trace import Tracer
+from project_paths import relative_file
+
+tracer = Tracer.from_env('validate-data')
+
+# Performance budgets: metric -> (budget, slack). A metric fails when it exceeds
+# its budget, or when it exceeds the rolling baseline by more than
+# REGRESSION_TOLERANCE plus the absolute slack (which absorbs timer noise).
+# Override per project with .observer/perf_budgets.json, e.g. {"generation_ms": 90000}.
+PERF_BUDGETS = {
+    'generation_ms': (120000, 500),
+    'fix_this_bytes': (5 * 1024 * 1024, 4096),
+    'smart_analysis_bytes': (5 * 1024 * 1024, 4096),
+    'issue_count': (None, 5),
+    'pattern_insights_ms': (5000, 50),
+    'dependency_analysis_ms': (30000, 200),
+    'validation_ms': (15000, 500)
+}
+# Declared artifact schemas: ijson-style prefix -> required fields and types
+FIX_THIS_SCHEMA = {
+    '': {'issue_buckets': 'array', 'stats': 'object'},
+    'issue_buckets.item': {'name': 'string', 'count': 'number', 'issues': 'array'},
+    'issue_buckets.item.issues.item': {'file': 'string', 'rule': 'string', 'severity': 'string', 'message': 'string'},
+    'stats': {'total_issues_found': 'number'},
+    'stats.by_bucket.item': {'name': 'string', 'count': 'number'}
+}
+SMART_ANALYSIS_SCHEMA = {
+    '': {'stats': 'object'},
+    'stats': {'total_issues_found': 'number'}
+}
+# Issue fields read from the FIX_THIS scan for the scoping and fingerprint checks
+ISSUE_FIELDS = ('file', 'line', 'rule', 'severity', 'message')
+AI_DRIFT_RULES = ['File Size Warnings', 'Duplicate Functions', 'Export Completeness']
+
+BASELINE_WINDOW = 10
+HISTORY_MAX_RUNS = 200  # perf_history.jsonl is trimmed to this many runs
+BASELINE_MIN_RUNS = 3
+REGRESSION_TOLERANCE = 0.25
 
 class DataValidator:
-    def __init__(self, observer_root='/Users/rajatdhanda/Tech/Projects/ai-observer'):
+    def __init__(self, observer_root='/Users/rajatdhanda/Tech/Projects/ai-observer', affected_only=False):
         self.root = Path(observer_root)
         self.observer_dir = self.root / '.observer'
         self.checklist = {}
+        # Affected-only mode: issue checks cover just the files in .observer/affected.json
+        self.affected = load_affected(self.observer_dir) if affected_only else None
+        self.history_file = self.observer_dir / 'perf_history.jsonl'
+        self.budgets = self.load_budgets()
+        self.perf_metrics = None
+        self.perf_history = None
+        # Affected-only runs are much faster, so they get their own baseline
+        self.perf_scope = 'all' if self.affected is None else 'affected'
+        self.artifact_scan = None
+        self.started = time.perf_counter()
         self.validation_results = {
             'timestamp': datetime.now().isoformat(),
+            'scope': 'all' if self.affected is None else f'affected ({len(self.affected)} files)',
             'checks': {},
             'summary': {
                 'total_checks': 0,
@@ -33,7 +91,9 @@ class DataValidator:
         print("=" * 50)
         
         # Define validation checks
+        # Schemas first: the checks after it read the same scan and tolerate what it reports
         checks = [
+            ('Artifact schemas valid', self.check_artifact_schemas),
             ('FIX_THIS.json exists', self.check_fix_this_exists),
             ('FIX_THIS has issue buckets', self.check_fix_this_buckets),
             ('Smart analysis data exists', self.check_smart_analysis),
@@ -45,12 +105,22 @@ class DataValidator:
             ('Table mappings present', self.check_table_mappings),
             ('Hook analysis present', self.check_hook_analysis),
             ('Severity distribution valid', self.check_severity_distribution),
-            ('Analysis timestamp recent', self.check_timestamp_freshness)
+            ('Analysis timestamp recent', self.check_timestamp_freshness),
+            ('Issue fingerprints tracked', self.check_issue_fingerprints)
+        ]
+        
+        # Performance budget checks (run last so validation_ms covers the checks above)
+        checks += [
+            ('Analysis generation time within budget', self.check_generation_budget),
+            ('Artifact sizes within budget', self.check_artifact_size_budget),
+            ('Issue count stable vs baseline', self.check_issue_count_baseline),
+            ('Script durations within budget', self.check_script_duration_budget)
         ]
         
         # Run each check
         for check_name, check_func in checks:
-            result = check_func()
+            with tracer.span(check_name):
+                result = check_func()
             self.validation_results['checks'][check_name] = result
             self.validation_results['summary']['total_checks'] += 1
             
@@ -65,7 +135,9 @@ class DataValidator:
                 print(f"❌ {check_name}: {result['message']}")
         
         # Save results
-        self.save_results()
+        with tracer.span('save_results'):
+            self.record_perf_history()
+            self.save_results()
         
         # Print summary
         self.print_summary()
@@ -74,11 +146,9 @@ class DataValidator:
         """Check if FIX_THIS.json exists"""
         fix_this = self.observer_dir / 'FIX_THIS.json'
         if fix_this.exists():
-            with open(fix_this) as f:
-                data = json.load(f)
             return {
                 'status': 'pass',
-                'value': f"Found with {len(data.get('issues', []))} issues"
+                'value': f"Found with {self.scan_artifacts()['top_issues']} issues"
             }
         return {
             'status': 'fail',
@@ -90,14 +160,11 @@ class DataValidator:
         fix_this = self.observer_dir / 'FIX_THIS.json'
         if not fix_this.exists():
             return {'status': 'fail', 'message': 'FIX_THIS.json missing'}
-            
-        with open(fix_this) as f:
-            data = json.load(f)
         
-        buckets = data.get('issue_buckets', [])
+        buckets = self.scan_artifacts()['buckets']
         if buckets:
-            bucket_names = [b['name'] for b in buckets]
-            total_issues = sum(b['count'] for b in buckets)
+            bucket_names = [str(b['name'] or '?') for b in buckets]
+            total_issues = sum(b['actual'] if b['count'] is None else b['count'] for b in buckets)
             return {
                 'status': 'pass',
                 'value': f"{len(buckets)} buckets: {', '.join(bucket_names)} ({total_issues} issues)"
@@ -111,10 +178,7 @@ class DataValidator:
         """Check smart analysis data"""
         analysis_file = self.observer_dir / 'smart_analysis.json'
         if analysis_file.exists():
-            with open(analysis_file) as f:
-                data = json.load(f)
-            stats = data.get('stats', {})
-            total = stats.get('total_issues_found', 0)
+            total = self.scan_artifacts()['smart_total'] or 0
             return {
                 'status': 'pass',
                 'value': f"{total} total issues analyzed"
@@ -129,29 +193,32 @@ class DataValidator:
         fix_this = self.observer_dir / 'FIX_THIS.json'
         if not fix_this.exists():
             return {'status': 'fail', 'message': 'FIX_THIS.json missing'}
-            
-        with open(fix_this) as f:
-            data = json.load(f)
         
-        # Check in bucket issues
-        buckets = data.get('issue_buckets', [])
-        contract_count = 0
-        for bucket in buckets:
-            for issue in bucket.get('issues', []):
-                if 'contract' in issue.get('rule', '').lower() or 'contract' in issue.get('message', '').lower():
-                    contract_count += 1
+        # Counted per bucket issue during the scan
+        contract_count = self.scan_artifacts()['contract_count']
         
         if contract_count > 0:
             return {
                 'status': 'pass',
                 'value': f"{contract_count} contract compliance issues found"
             }
+        if self.affected is not None:
+            return {
+                'status': 'pass',
+                'value': f"No contract compliance issues in {len(self.affected)} affected files"
+            }
         
         return {
             'status': 'fail',
             'message': 'No contract compliance validation found'
         }
     
+    def scoped_issues(self, data: Dict) -> List[Dict]:
+        """Issues from a FIX_THIS-shaped document, limited to the affected set in affected-only mode"""
+        if self.affected is not None:
+            data = filter_fixes(data, self.affected)
+        return [issue for bucket in data.get('issue_buckets', []) for issue in bucket.get('issues', [])]
+    
     def check_nine_rules(self) -> Dict:
         """Check nine rules validation"""
         nine_rules = self.observer_dir / 'nine_rules_validation.json'
@@ -173,27 +240,33 @@ class DataValidator:
         fix_this = self.observer_dir / 'FIX_THIS.json'
         if not fix_this.exists():
             return {'status': 'fail', 'message': 'FIX_THIS.json missing'}
-            
-        with open(fix_this) as f:
-            data = json.load(f)
         
-        ai_drift_rules = ['File Size Warnings', 'Duplicate Functions', 'Export Completeness']
-        found_rules = []
+        # Drift rules seen in bucket issues during the scan
+        found_rules = list(self.scan_artifacts()['drift_rules'])
         
-        # Check in bucket issues
-        buckets = data.get('issue_buckets', [])
-        for bucket in buckets:
-            for issue in bucket.get('issues', []):
-                rule = issue.get('rule', '')
-                if any(r in rule for r in ai_drift_rules):
-                    if rule not in found_rules:
-                        found_rules.append(rule)
+        # Duplicated regions found by duplicate_detector (written by analyze-dependencies.py)
+        duplicates_file = self.observer_dir / 'duplicates.json'
+        duplicate_regions = 0
+        if duplicates_file.exists():
+            duplicate_regions = len(self.scoped_issues(read_artifact(duplicates_file)))
+            if duplicate_regions and 'Duplicate Functions' not in found_rules:
+                found_rules.append('Duplicate Functions')
         
         if found_rules:
+            if duplicate_regions:
+                return {
+                    'status': 'pass',
+                    'value': f"AI drift detection active: {', '.join(found_rules)} ({duplicate_regions} duplicated regions)"
+                }
             return {
                 'status': 'pass',
                 'value': f"AI drift detection active: {', '.join(found_rules)}"
             }
+        if self.affected is not None:
+            return {
+                'status': 'pass',
+                'value': f"No AI drift issues in {len(self.affected)} affected files"
+            }
         return {
             'status': 'fail',
             'message': 'No AI drift detection found (File Size, Duplicate Functions, Export Completeness)'
@@ -237,42 +310,191 @@ class DataValidator:
                 'message': 'Dashboard not running or not accessible'
             }
     
-    def check_issue_counts(self) -> Dict:
-        """Check if issue counts are consistent across files"""
-        counts = {}
+    def scan_artifact(self, path: Path, schema: Dict, collect) -> List[str]:
+        """Stream an artifact once, checking its schema and feeding collect(prefix, event, value)"""
+        checker = SchemaChecker(schema)
+        try:
+            for prefix, event, value in iter_file_events(path):
+                checker.feed(prefix, event, value)
+                collect(prefix, event, value)
+        except StreamError as e:
+            checker.error(f"malformed JSON: {e}")
+        
+        errors = [f"{path.name}: {error}" for error in checker.errors]
+        if checker.error_count > len(checker.errors):
+            errors.append(f"{path.name}: ... {checker.error_count - len(checker.errors)} more")
+        return errors
+    
+    def scan_artifacts(self) -> Dict:
+        """Read FIX_THIS.json and smart_analysis.json once for every check that needs them (cached)
+
+        Bucket issues are folded into counts, drift rules and the fingerprint
+        index as each one ends, so no issue list is kept.
+        """
+        if self.artifact_scan is not None:
+            return self.artifact_scan
         
-        # Check FIX_THIS.json
         fix_this = self.observer_dir / 'FIX_THIS.json'
-        if fix_this.exists():
-            with open(fix_this) as f:
-                data = json.load(f)
+        # Issue paths are made project-relative; 'project' sits in the header
+        try:
+            project = read_header(fix_this, ['project']).get('project') if fix_this.exists() else None
+        except StreamError:
+            project = None  # Reported by the schema scan below
+        if not isinstance(project, str):
+            project = None
+        
+        scan = {
+            'schema_errors': [],
+            'project': project,
+            'generated': None,
+            'top_issues': 0,
+            'buckets': [],
+            'severity': Counter(),
+            'contract_count': 0,
+            'drift_rules': [],
+            'fingerprints': FingerprintIndex(project),
+            'stats_total': None,
+            'generation_ms': None,
+            'insights_ms': None,
+            'by_bucket': [],
+            'by_severity': {},
+            'smart_total': None
+        }
+        
+        issue_item = 'issue_buckets.item.issues.item'
+        issue_prefix = issue_item + '.'
+        issue = {}  # Scalar ISSUE_FIELDS of the bucket issue being read
+        
+        def finish_issue():
+            """Fold one bucket issue into the scan; fields the schema rejects are coerced"""
+            fields = {field: str(issue.get(field) or '') for field in ('file', 'rule', 'severity', 'message')}
+            line = issue.get('line')
+            fields['line'] = line if isinstance(line, (int, float)) and not isinstance(line, bool) else 0
             
-            # Count issues in buckets (new structure)
-            buckets = data.get('issue_buckets', [])
-            if buckets:
-                actual_count = sum(len(b.get('issues', [])) for b in buckets)
-                counts['actual_issues'] = actual_count
-                counts['bucket_total'] = sum(b['count'] for b in buckets)
-        
-        # Check smart_analysis.json
+            scan['buckets'][-1]['actual'] += 1
+            if 'severity' in issue:
+                scan['severity'][fields['severity']] += 1
+            scan['fingerprints'].add(fields)
+            
+            if self.affected is not None and relative_file(fields['file'], project) not in self.affected:
+                return
+            if 'contract' in fields['rule'].lower() or 'contract' in fields['message'].lower():
+                scan['contract_count'] += 1
+            rule = fields['rule']
+            if any(r in rule for r in AI_DRIFT_RULES) and rule not in scan['drift_rules']:
+                scan['drift_rules'].append(rule)
+        
+        def collect_fix_this(prefix, event, value):
+            if event == 'start_map':
+                if prefix == 'issue_buckets.item':
+                    scan['buckets'].append({'name': None, 'count': None, 'actual': 0})
+                elif prefix == issue_item:
+                    issue.clear()
+                elif prefix == 'issues.item':
+                    scan['top_issues'] += 1
+                elif prefix == 'stats.by_bucket.item':
+                    scan['by_bucket'].append({'name': None, 'count': None})
+            elif event == 'end_map':
+                if prefix == issue_item:
+                    finish_issue()
+            elif event in ('map_key', 'start_array', 'end_array'):
+                return
+            elif prefix.startswith(issue_prefix) and prefix[len(issue_prefix):] in ISSUE_FIELDS:
+                issue[prefix[len(issue_prefix):]] = value
+            elif prefix == 'generated':
+                scan['generated'] = value
+            elif prefix == 'issues.item':
+                scan['top_issues'] += 1
+            elif prefix == 'issue_buckets.item.name':
+                scan['buckets'][-1]['name'] = value
+            elif prefix == 'stats.by_bucket.item.name':
+                scan['by_bucket'][-1]['name'] = value
+            elif event != 'number':
+                return  # Remaining fields are counts and timings
+            elif prefix == 'stats.generation_ms':
+                scan['generation_ms'] = value
+            elif prefix == 'ai_insights.duration_ms':
+                scan['insights_ms'] = value
+            elif prefix == 'issue_buckets.item.count':
+                scan['buckets'][-1]['count'] = value
+            elif prefix == 'stats.total_issues_found':
+                scan['stats_total'] = value
+            elif prefix == 'stats.by_bucket.item.count':
+                scan['by_bucket'][-1]['count'] = value
+            elif prefix.startswith('stats.by_severity.'):
+                scan['by_severity'][prefix[len('stats.by_severity.'):]] = value
+        
+        def collect_smart(prefix, event, value):
+            if prefix == 'stats.total_issues_found' and event == 'number':
+                scan['smart_total'] = value
+        
+        if fix_this.exists():
+            scan['schema_errors'] += self.scan_artifact(fix_this, FIX_THIS_SCHEMA, collect_fix_this)
         smart_file = self.observer_dir / 'smart_analysis.json'
         if smart_file.exists():
-            with open(smart_file) as f:
-                data = json.load(f)
-            stats = data.get('stats', {})
-            counts['smart_analysis'] = stats.get('total_issues_found', 0)
+            scan['schema_errors'] += self.scan_artifact(smart_file, SMART_ANALYSIS_SCHEMA, collect_smart)
         
-        # Validate consistency
-        if len(set(counts.values())) == 1:
+        self.artifact_scan = scan
+        return scan
+    
+    def check_artifact_schemas(self) -> Dict:
+        """Check FIX_THIS.json and smart_analysis.json against their declared schemas"""
+        errors = self.scan_artifacts()['schema_errors']
+        if errors:
             return {
-                'status': 'pass',
-                'value': f"All counts consistent: {list(counts.values())[0]} issues"
+                'status': 'fail',
+                'message': f"{len(errors)} schema problems: {'; '.join(errors[:5])}"
             }
-        else:
+        return {
+            'status': 'pass',
+            'value': 'FIX_THIS.json and smart_analysis.json match their schemas'
+        }
+    
+    def check_issue_counts(self) -> Dict:
+        """Check if issue counts are consistent across files"""
+        scan = self.scan_artifacts()
+        counts = {}
+        problems = []
+        
+        # Per-bucket declared count vs issues actually listed
+        for bucket in scan['buckets']:
+            if bucket['count'] is not None and bucket['count'] != bucket['actual']:
+                problems.append(f"bucket {bucket['name']} declares {bucket['count']} but lists {bucket['actual']}")
+        
+        if scan['buckets']:
+            counts['actual_issues'] = sum(b['actual'] for b in scan['buckets'])
+            counts['bucket_total'] = sum(b['count'] or 0 for b in scan['buckets'])
+        if scan['stats_total'] is not None:
+            counts['stats_total'] = scan['stats_total']
+        if scan['smart_total'] is not None:
+            counts['smart_analysis'] = scan['smart_total']
+        
+        # stats.by_bucket and stats.by_severity must agree with the listed issues
+        actual_by_bucket = {b['name']: b['actual'] for b in scan['buckets']}
+        for entry in scan['by_bucket']:
+            if entry['name'] in actual_by_bucket and entry['count'] != actual_by_bucket[entry['name']]:
+                problems.append(f"stats.by_bucket {entry['name']}={entry['count']} but bucket lists {actual_by_bucket[entry['name']]}")
+        for severity, count in scan['by_severity'].items():
+            if scan['buckets'] and count != scan['severity'][severity]:
+                problems.append(f"stats.by_severity {severity}={count} but {scan['severity'][severity]} issues listed")
+        
+        if len(set(counts.values())) > 1:
+            problems.insert(0, f"Inconsistent counts: {counts}")
+        
+        if problems:
+            return {
+                'status': 'warning',
+                'message': '; '.join(problems)
+            }
+        if not counts:
             return {
                 'status': 'warning',
-                'message': f"Inconsistent counts: {counts}"
+                'message': 'No issue counts found'
             }
+        return {
+            'status': 'pass',
+            'value': f"All counts consistent: {list(counts.values())[0]} issues"
+        }
     
     def check_table_mappings(self) -> Dict:
         """Check if table mappings are present"""
@@ -311,12 +533,8 @@ class DataValidator:
         fix_this = self.observer_dir / 'FIX_THIS.json'
         if not fix_this.exists():
             return {'status': 'fail', 'message': 'FIX_THIS.json missing'}
-            
-        with open(fix_this) as f:
-            data = json.load(f)
         
-        stats = data.get('stats', {})
-        severity = stats.get('by_severity', {})
+        severity = self.scan_artifacts()['by_severity']
         
         if severity:
             distribution = ', '.join([f"{k}: {v}" for k, v in severity.items()])
@@ -334,11 +552,12 @@ class DataValidator:
         fix_this = self.observer_dir / 'FIX_THIS.json'
         if not fix_this.exists():
             return {'status': 'fail', 'message': 'FIX_THIS.json missing'}
-            
-        with open(fix_this) as f:
-            data = json.load(f)
         
-        generated = data.get('generated', '')
+        # 'generated' is near the top of FIX_THIS.json - no need to parse the issues
+        try:
+            generated = read_header(fix_this, ['generated']).get('generated', '')
+        except StreamError:
+            generated = ''
         if generated:
             # Parse timestamp
             from datetime import datetime
@@ -369,11 +588,245 @@ class DataValidator:
             'message': 'No timestamp found'
         }
     
+    def check_issue_fingerprints(self) -> Dict:
+        """Deduplicate issues by fingerprint and classify them against the previous run"""
+        fix_this = self.observer_dir / 'FIX_THIS.json'
+        if not fix_this.exists():
+            return {'status': 'fail', 'message': 'FIX_THIS.json missing'}
+        
+        scan = self.scan_artifacts()
+        current = scan['fingerprints']
+        
+        # Rotate only when FIX_THIS.json was regenerated, so re-validating the
+        # same analysis keeps comparing against the run before it
+        store_file = self.observer_dir / 'issue_fingerprints.json'
+        store = load_index(store_file) or {}
+        generated = scan['generated']
+        if store.get('generated') == generated:
+            previous_data = store.get('previous')
+        else:
+            previous_data = store.get('current')
+        
+        write_artifact(store_file, {
+            'generated': generated,
+            'current': current.to_dict(),
+            'previous': previous_data
+        }, header_keys=['generated'])
+        
+        summary = f"{len(current)} unique issues ({current.duplicates} duplicates collapsed)"
+        if previous_data is None:
+            return {
+                'status': 'pass',
+                'value': f"{summary}, first tracked run"
+            }
+        
+        previous = FingerprintIndex.from_dict(previous_data)
+        diff = current.diff(previous)
+        self.validation_results['issue_changes'] = {
+            'new': [current.entries[fp] for fp in diff['new']],
+            'fixed': [previous.entries[fp] for fp in diff['fixed']],
+            'persisting': len(diff['persisting'])
+        }
+        return {
+            'status': 'pass',
+            'value': f"{summary}; new: {len(diff['new'])}, fixed: {len(diff['fixed'])}, persisting: {len(diff['persisting'])}"
+        }
+    
+    def load_budgets(self) -> Dict:
+        """Load performance budgets, applying overrides from perf_budgets.json"""
+        budgets = dict(PERF_BUDGETS)
+        overrides_file = self.observer_dir / 'perf_budgets.json'
+        if overrides_file.exists():
+            try:
+                with open(overrides_file) as f:
+                    overrides = json.load(f)
+                if not isinstance(overrides, dict):
+                    raise ValueError('perf_budgets.json must be an object')
+                for metric, budget in overrides.items():
+                    if metric not in budgets:
+                        continue
+                    if budget is not None and (isinstance(budget, bool) or not isinstance(budget, (int, float))):
+                        print(f"⚠️  Ignoring perf_budgets.json {metric}={budget!r}: budget must be a number or null")
+                        continue
+                    budgets[metric] = (budget, budgets[metric][1])
+            except (OSError, ValueError):
+                pass
+        return budgets
+    
+    def load_perf_history(self) -> List[Dict]:
+        """Load recent runs from perf_history.jsonl (cached across the budget checks)"""
+        if self.perf_history is not None:
+            return self.perf_history
+        
+        # The file is trimmed on write, but cap memory even if it was appended to elsewhere
+        recent = deque(maxlen=HISTORY_MAX_RUNS)
+        if self.history_file.exists():
+            with open(self.history_file) as f:
+                for line in f:
+                    try:
+                        recent.append(json.loads(line))
+                    except ValueError:
+                        continue  # Tolerate a torn final line from an interrupted run
+        self.perf_history = list(recent)
+        return self.perf_history
+    
+    def collect_perf_metrics(self) -> Dict:
+        """Collect cost metrics for this run (cached across the budget checks)"""
+        if self.perf_metrics is not None:
+            return self.perf_metrics
+        
+        metrics = {}
+        fix_this = self.observer_dir / 'FIX_THIS.json'
+        if fix_this.exists():
+            metrics['fix_this_bytes'] = fix_this.stat().st_size
+            scan = self.scan_artifacts()
+            if scan['generation_ms'] is not None:
+                metrics['generation_ms'] = scan['generation_ms']
+            if scan['stats_total'] is not None:
+                metrics['issue_count'] = scan['stats_total']
+            if scan['insights_ms'] is not None:
+                metrics['pattern_insights_ms'] = scan['insights_ms']
+        
+        smart_file = self.observer_dir / 'smart_analysis.json'
+        if smart_file.exists():
+            metrics['smart_analysis_bytes'] = smart_file.stat().st_size
+        
+        # Whole-run time (report, graph shards, duplicates, history); older runs only
+        # recorded the analysis phase in the report summary
+        timing_file = self.observer_dir / 'dependency-timing.json'
+        deps_file = self.observer_dir / 'dependency-analysis.json'
+        try:
+            if timing_file.exists():
+                timing = read_artifact(timing_file)
+            elif deps_file.exists():
+                timing = read_header(deps_file, ['summary']).get('summary', {})
+            else:
+                timing = {}
+        except ValueError:
+            timing = {}
+        if isinstance(timing, dict) and isinstance(timing.get('duration_ms'), (int, float)):
+            metrics['dependency_analysis_ms'] = timing['duration_ms']
+        
+        metrics['validation_ms'] = round((time.perf_counter() - self.started) * 1000, 2)
+        
+        self.perf_metrics = metrics
+        return metrics
+    
+    def find_regressions(self, metric_names: List[str]) -> List[str]:
+        """Compare metrics against their budgets and the rolling baseline"""
+        metrics = self.collect_perf_metrics()
+        history = self.load_perf_history()
+        regressions = []
+        
+        for name in metric_names:
+            if name not in metrics:
+                continue
+            value = metrics[name]
+            budget, slack = self.budgets[name]
+            
+            if budget is not None and value > budget:
+                regressions.append(f"{name}={value} over budget {budget}")
+                continue
+            
+            baseline = self.baseline(history, name)
+            if baseline is not None and value > baseline * (1 + REGRESSION_TOLERANCE) + slack:
+                regressions.append(f"{name}={value} regressed from baseline {baseline}")
+        
+        return regressions
+    
+    def baseline(self, history: List[Dict], name: str) -> Optional[float]:
+        """Rolling median of a metric over earlier analyses in this scope, if enough runs exist"""
+        generated = self.artifact_generated()
+        values = [run['metrics'][name] for run in history
+                  if run.get('scope', 'all') == self.perf_scope and name in run.get('metrics', {})
+                  and (generated is None or run.get('generated') != generated)]
+        values = values[-BASELINE_WINDOW:]
+        if len(values) < BASELINE_MIN_RUNS:
+            return None
+        return statistics.median(values)
+    
+    def budget_check(self, metric_names: List[str], label: str) -> Dict:
+        """Shared result shape for the performance budget checks"""
+        metrics = self.collect_perf_metrics()
+        present = [name for name in metric_names if name in metrics]
+        if not present:
+            return {
+                'status': 'warning',
+                'message': f'No {label} metrics recorded yet'
+            }
+        
+        regressions = self.find_regressions(present)
+        if regressions:
+            return {
+                'status': 'fail',
+                'message': f"{label} regression: {'; '.join(regressions)}"
+            }
+        return {
+            'status': 'pass',
+            'value': ', '.join(f"{name}={metrics[name]}" for name in present)
+        }
+    
+    def check_generation_budget(self) -> Dict:
+        """Check how long the smart analyzer took to generate FIX_THIS.json"""
+        return self.budget_check(['generation_ms'], 'Generation time')
+    
+    def check_artifact_size_budget(self) -> Dict:
+        """Check FIX_THIS.json and smart_analysis.json sizes"""
+        return self.budget_check(['fix_this_bytes', 'smart_analysis_bytes'], 'Artifact size')
+    
+    def check_issue_count_baseline(self) -> Dict:
+        """Check issue count against the rolling baseline"""
+        return self.budget_check(['issue_count'], 'Issue count')
+    
+    def check_script_duration_budget(self) -> Dict:
+        """Check Python script durations (pattern insights, dependency analysis, validation)"""
+        return self.budget_check(
+            ['pattern_insights_ms', 'dependency_analysis_ms', 'validation_ms'],
+            'Script duration'
+        )
+    
+    def artifact_generated(self) -> Optional[str]:
+        """FIX_THIS.json 'generated' timestamp, identifying the analysis being validated"""
+        if not (self.observer_dir / 'FIX_THIS.json').exists():
+            return None
+        return self.scan_artifacts()['generated']
+    
+    def record_perf_history(self):
+        """Record this run's metrics in perf_history.jsonl, trimming it to HISTORY_MAX_RUNS
+
+        Rows are keyed on FIX_THIS.json 'generated': re-validating the same
+        analysis replaces its row instead of adding another, so repeated
+        runs cannot drag the baseline towards a regressed artifact.
+        """
+        metrics = self.collect_perf_metrics()
+        entry = {
+            'timestamp': self.validation_results['timestamp'],
+            'generated': self.artifact_generated(),
+            'scope': self.perf_scope,
+            'metrics': metrics
+        }
+        self.validation_results['perf_metrics'] = metrics
+        history = self.load_perf_history()
+        previous = next((i for i in range(len(history) - 1, -1, -1)
+                         if history[i].get('scope', 'all') == self.perf_scope), None)
+        replace = (entry['generated'] is not None and previous is not None
+                   and history[previous].get('generated') == entry['generated'])
+        if replace:
+            history = history[:previous] + history[previous + 1:] + [entry]
+        else:
+            history = history + [entry]
+        if replace or len(history) > HISTORY_MAX_RUNS:
+            lines = [json.dumps(run, separators=(',', ':')) for run in history[-HISTORY_MAX_RUNS:]]
+            atomic_write_bytes(self.history_file, ('\n'.join(lines) + '\n').encode('utf-8'))
+        else:
+            with open(self.history_file, 'a') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self.perf_history = history[-HISTORY_MAX_RUNS:]
+    
     def save_results(self):
         """Save validation results"""
         output_file = self.observer_dir / 'validation_results.json'
-        with open(output_file, 'w') as f:
-            json.dump(self.validation_results, f, indent=2)
+        write_artifact(output_file, self.validation_results, header_keys=['timestamp', 'summary'])
     
     def print_summary(self):
         """Print validation summary"""
@@ -405,8 +858,15 @@ class DataValidator:
 
 
 def main():
-    validator = DataValidator()
+    parser = argparse.ArgumentParser(description='Validate AI Observer data integrity')
+    parser.add_argument('--root', default='/Users/rajatdhanda/Tech/Projects/ai-observer', help='project root')
+    parser.add_argument('--affected', action='store_true',
+                        help='limit issue checks to .observer/affected.json (see analyze-dependencies.py --affected)')
+    args = parser.parse_args()
+    
+    validator = DataValidator(args.root, affected_only=args.affected)
     validator.validate()
+    tracer.finish()
 
 
 if __name__ == '__main__':
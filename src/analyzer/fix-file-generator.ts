@@ -16,7 +16,7 @@ export class FixFileGenerator {
     private contextDetector: ProjectContextDetector
   ) {}
 
-  generateEnhancedFixFile(buckets: IssueBucket[]): void {
+  generateEnhancedFixFile(buckets: IssueBucket[], startedAt: number = Date.now()): void {
     const outputDir = path.join(this.projectPath, '.observer');
     if (!fs.existsSync(outputDir)) {
       fs.mkdirSync(outputDir, { recursive: true });
@@ -82,7 +82,8 @@ export class FixFileGenerator {
         
         buckets_total: buckets.length,
         fixed_since_last_run: fixedCount,
-        remaining_issues: totalIssues
+        remaining_issues: totalIssues,
+        generation_ms: Date.now() - startedAt // Read by validate-data.py performance budgets
       },
       
       // Context without step-by-step instructions
@@ -124,9 +125,9 @@ export class FixFileGenerator {
     }
     
     // Write the enhanced file to .observer
-    fs.writeFileSync(
+    this.writeJsonAtomic(
       path.join(outputDir, 'FIX_THIS.json'),
-      JSON.stringify(finalFixFile, null, 2)
+      finalFixFile
     );
     
     // Also save to src/contracts/fixes.json for new project structure
@@ -134,9 +135,9 @@ export class FixFileGenerator {
     if (!fs.existsSync(contractsDir)) {
       fs.mkdirSync(contractsDir, { recursive: true });
     }
-    fs.writeFileSync(
+    this.writeJsonAtomic(
       path.join(contractsDir, 'fixes.json'),
-      JSON.stringify(finalFixFile, null, 2)
+      finalFixFile
     );
     
     // Save context.json with essential project info for AI
@@ -155,9 +156,9 @@ export class FixFileGenerator {
       build_commands: this.contextDetector.getBuildCommands()
     };
     
-    fs.writeFileSync(
+    this.writeJsonAtomic(
       path.join(contractsDir, 'context.json'),
-      JSON.stringify(contextFile, null, 2)
+      contextFile
     );
     
     // Save current state for next run
@@ -202,8 +203,20 @@ export class FixFileGenerator {
     return null;
   }
 
+  // Write to a temp file and rename into place so readers never see a half-written file
+  private writeJsonAtomic(filePath: string, data: any): void {
+    const tmpPath = `${filePath}.${process.pid}.tmp`;
+    try {
+      fs.writeFileSync(tmpPath, JSON.stringify(data, null, 2));
+      fs.renameSync(tmpPath, filePath);
+    } catch (error) {
+      fs.rmSync(tmpPath, { force: true }); // Don't leave a stray temp file behind
+      throw error;
+    }
+  }
+
   private saveState(state: any): void {
     const statePath = path.join(this.projectPath, '.observer', 'analysis_state.json');
-    fs.writeFileSync(statePath, JSON.stringify(state, null, 2));
+    this.writeJsonAtomic(statePath, state);
   }
 }
\ No newline at end of file
@@ -2,21 +2,47 @@
 """
 AI Pattern Insights Analyzer
 Analyzes issues to find patterns and generate intelligent insights
+
+Usage:
+  python3 pattern-insights.py [--affected] < FIX_THIS.json
+  python3 pattern-insights.py --batch [--out DIR] [--workers N] PATH_OR_GLOB...
 """
 
+import argparse
+import glob
 import json
+import os
 import sys
+import time
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import re
+import sqlite3
+
+# Shared helpers live in the repo's scripts/ directory (two levels up from src/ or dist/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from affected_files import filter_fixes, load_affected
+from history_store import HistoryStore
+from issue_fingerprints import FingerprintIndex, iter_issues
+from observer_artifacts import write_artifact
+from observer_trace import Tracer
+
+tracer = Tracer.from_env("pattern-insights")
 
-def analyze_patterns(fixes_data):
-    """Analyze issues to find patterns and generate insights"""
+def analyze_patterns(fixes_data, with_counts=False):
+    """Analyze issues to find patterns and generate insights
     
+    With with_counts=True, returns (insights, counts) where counts holds
+    the per-file and per-rule issue Counters (used by batch mode).
+    """
+    
+    counts = {"files": Counter(), "rules": Counter()}
     insights = {
         "patterns": [],
         "hotspots": [],
         "recommendations": [],
+        "collapsed": [],
         "summary": {}
     }
     
@@ -28,7 +54,7 @@ def analyze_patterns(fixes_data):
         # Old format: issue_buckets under analysis
         buckets = fixes_data["analysis"]["issue_buckets"]
     else:
-        return insights
+        return (insights, counts) if with_counts else insights
     
     # Collect all issues
     all_issues = []
@@ -36,131 +62,314 @@ def analyze_patterns(fixes_data):
         all_issues.extend(bucket.get("issues", []))
     
     if not all_issues:
-        return insights
+        return (insights, counts) if with_counts else insights
     
     total_issues = len(all_issues)
     
     # 1. Analyze file path patterns
-    path_patterns = defaultdict(list)
-    file_counts = Counter()
+    with tracer.span("path_patterns"):
+        path_patterns = defaultdict(list)
+        file_counts = counts["files"]
     
-    for issue in all_issues:
-        file_path = issue.get("file", "")
-        file_counts[file_path] += 1
+        for issue in all_issues:
+            file_path = issue.get("file", "")
+            file_counts[file_path] += 1
         
-        # Categorize by path patterns
-        if "/admin/" in file_path or "admin" in file_path.lower():
-            path_patterns["admin"].append(issue)
-        if "hook" in file_path.lower() or "/hooks/" in file_path:
-            path_patterns["hooks"].append(issue)
-        if "component" in file_path.lower() or "/components/" in file_path:
-            path_patterns["components"].append(issue)
-        if "/api/" in file_path:
-            path_patterns["api"].append(issue)
-        if "page.tsx" in file_path or "page.ts" in file_path:
-            path_patterns["pages"].append(issue)
-        if "db" in file_path.lower() or "database" in file_path.lower() or "prisma" in file_path.lower():
-            path_patterns["database"].append(issue)
-        if "auth" in file_path.lower():
-            path_patterns["authentication"].append(issue)
+            # Categorize by path patterns
+            if "/admin/" in file_path or "admin" in file_path.lower():
+                path_patterns["admin"].append(issue)
+            if "hook" in file_path.lower() or "/hooks/" in file_path:
+                path_patterns["hooks"].append(issue)
+            if "component" in file_path.lower() or "/components/" in file_path:
+                path_patterns["components"].append(issue)
+            if "/api/" in file_path:
+                path_patterns["api"].append(issue)
+            if "page.tsx" in file_path or "page.ts" in file_path:
+                path_patterns["pages"].append(issue)
+            if "db" in file_path.lower() or "database" in file_path.lower() or "prisma" in file_path.lower():
+                path_patterns["database"].append(issue)
+            if "auth" in file_path.lower():
+                path_patterns["authentication"].append(issue)
     
     # 2. Analyze issue types
-    issue_types = defaultdict(int)
-    for issue in all_issues:
-        message = issue.get("message", "").lower()
+    with tracer.span("issue_types"):
+        issue_types = defaultdict(int)
+        for issue in all_issues:
+            counts["rules"][issue.get("rule", "")] += 1
+            message = issue.get("message", "").lower()
         
-        # Categorize by message patterns
-        if "onclick" in message or "button" in message or "handler" in message:
-            issue_types["missing_handlers"] += 1
-        if "loading" in message or "isloading" in message:
-            issue_types["loading_states"] += 1
-        if "error" in message and "handling" in message:
-            issue_types["error_handling"] += 1
-        if "type" in message or "typescript" in message or "any" in message:
-            issue_types["type_issues"] += 1
-        if "unused" in message or "never used" in message:
-            issue_types["unused_code"] += 1
-        if "undefined" in message or "null" in message:
-            issue_types["null_checks"] += 1
-        if "async" in message or "await" in message or "promise" in message:
-            issue_types["async_issues"] += 1
+            # Categorize by message patterns
+            if "onclick" in message or "button" in message or "handler" in message:
+                issue_types["missing_handlers"] += 1
+            if "loading" in message or "isloading" in message:
+                issue_types["loading_states"] += 1
+            if "error" in message and "handling" in message:
+                issue_types["error_handling"] += 1
+            if "type" in message or "typescript" in message or "any" in message:
+                issue_types["type_issues"] += 1
+            if "unused" in message or "never used" in message:
+                issue_types["unused_code"] += 1
+            if "undefined" in message or "null" in message:
+                issue_types["null_checks"] += 1
+            if "async" in message or "await" in message or "promise" in message:
+                issue_types["async_issues"] += 1
     
     # 3. Generate pattern insights
-    for pattern_name, issues in path_patterns.items():
-        percentage = (len(issues) / total_issues) * 100
-        if percentage >= 20:  # Significant if 20% or more
-            emoji = {
-                "admin": "👤",
-                "hooks": "🔄", 
-                "components": "🧩",
-                "api": "🌐",
-                "pages": "📄",
-                "database": "💾",
-                "authentication": "🔐"
-            }.get(pattern_name, "📍")
+    with tracer.span("pattern_insights"):
+        for pattern_name, issues in path_patterns.items():
+            percentage = (len(issues) / total_issues) * 100
+            if percentage >= 20:  # Significant if 20% or more
+                emoji = {
+                    "admin": "👤",
+                    "hooks": "🔄", 
+                    "components": "🧩",
+                    "api": "🌐",
+                    "pages": "📄",
+                    "database": "💾",
+                    "authentication": "🔐"
+                }.get(pattern_name, "📍")
             
-            insights["patterns"].append(
-                f"{emoji} {pattern_name.capitalize()} area has {len(issues)} issues ({percentage:.0f}% of total)"
-            )
+                insights["patterns"].append(
+                    f"{emoji} {pattern_name.capitalize()} area has {len(issues)} issues ({percentage:.0f}% of total)"
+                )
     
     # 4. Find hotspot files (top problematic files)
-    top_files = file_counts.most_common(5)
-    for file_path, count in top_files:
-        if count >= 3:  # Only show files with 3+ issues
-            file_name = Path(file_path).name
-            insights["hotspots"].append(f"{file_path} ({count} issues)")
+    with tracer.span("hotspots"):
+        top_files = file_counts.most_common(5)
+        for file_path, count in top_files:
+            if count >= 3:  # Only show files with 3+ issues
+                file_name = Path(file_path).name
+                insights["hotspots"].append(f"{file_path} ({count} issues)")
     
     # 5. Generate issue type insights
-    for issue_type, count in issue_types.items():
-        percentage = (count / total_issues) * 100
-        if percentage >= 15:  # Significant if 15% or more
-            type_descriptions = {
-                "missing_handlers": "Missing onClick/event handlers",
-                "loading_states": "Missing or incorrect loading states",
-                "error_handling": "Inadequate error handling",
-                "type_issues": "TypeScript type issues",
-                "unused_code": "Unused variables or imports",
-                "null_checks": "Missing null/undefined checks",
-                "async_issues": "Async/await problems"
-            }
-            desc = type_descriptions.get(issue_type, issue_type.replace("_", " ").title())
-            insights["patterns"].append(f"⚠️ {desc}: {count} occurrences ({percentage:.0f}%)")
+    with tracer.span("issue_type_insights"):
+        for issue_type, count in issue_types.items():
+            percentage = (count / total_issues) * 100
+            if percentage >= 15:  # Significant if 15% or more
+                type_descriptions = {
+                    "missing_handlers": "Missing onClick/event handlers",
+                    "loading_states": "Missing or incorrect loading states",
+                    "error_handling": "Inadequate error handling",
+                    "type_issues": "TypeScript type issues",
+                    "unused_code": "Unused variables or imports",
+                    "null_checks": "Missing null/undefined checks",
+                    "async_issues": "Async/await problems"
+                }
+                desc = type_descriptions.get(issue_type, issue_type.replace("_", " ").title())
+                insights["patterns"].append(f"⚠️ {desc}: {count} occurrences ({percentage:.0f}%)")
     
     # 6. Generate smart recommendations based on patterns
-    if path_patterns["admin"] and len(path_patterns["admin"]) >= total_issues * 0.3:
-        insights["recommendations"].append("Consider refactoring admin components - they contain 30%+ of all issues")
+    with tracer.span("recommendations"):
+        if path_patterns["admin"] and len(path_patterns["admin"]) >= total_issues * 0.3:
+            insights["recommendations"].append("Consider refactoring admin components - they contain 30%+ of all issues")
     
-    if issue_types["missing_handlers"] >= total_issues * 0.2:
-        insights["recommendations"].append("Implement a shared button component with proper handler validation")
+        if issue_types["missing_handlers"] >= total_issues * 0.2:
+            insights["recommendations"].append("Implement a shared button component with proper handler validation")
     
-    if issue_types["error_handling"] >= total_issues * 0.15:
-        insights["recommendations"].append("Add error boundaries and standardize error handling patterns")
+        if issue_types["error_handling"] >= total_issues * 0.15:
+            insights["recommendations"].append("Add error boundaries and standardize error handling patterns")
     
-    if path_patterns["hooks"] and len(path_patterns["hooks"]) >= total_issues * 0.25:
-        insights["recommendations"].append("Review and standardize React hooks implementation")
+        if path_patterns["hooks"] and len(path_patterns["hooks"]) >= total_issues * 0.25:
+            insights["recommendations"].append("Review and standardize React hooks implementation")
     
-    if issue_types["loading_states"] >= total_issues * 0.15:
-        insights["recommendations"].append("Create a consistent loading state management strategy")
+        if issue_types["loading_states"] >= total_issues * 0.15:
+            insights["recommendations"].append("Create a consistent loading state management strategy")
     
-    if len(top_files) > 0 and top_files[0][1] >= total_issues * 0.1:
-        insights["recommendations"].append(f"Priority: Fix {Path(top_files[0][0]).name} first - it has {top_files[0][1]} issues")
+        if len(top_files) > 0 and top_files[0][1] >= total_issues * 0.1:
+            insights["recommendations"].append(f"Priority: Fix {Path(top_files[0][0]).name} first - it has {top_files[0][1]} issues")
     
     # 7. Add summary statistics
-    insights["summary"] = {
-        "total_files_affected": len(file_counts),
-        "average_issues_per_file": round(total_issues / len(file_counts), 1) if file_counts else 0,
-        "most_common_issue_type": max(issue_types.items(), key=lambda x: x[1])[0] if issue_types else "unknown"
-    }
+    with tracer.span("summary"):
+        insights["summary"] = {
+            "total_files_affected": len(file_counts),
+            "average_issues_per_file": round(total_issues / len(file_counts), 1) if file_counts else 0,
+            "most_common_issue_type": max(issue_types.items(), key=lambda x: x[1])[0] if issue_types else "unknown"
+        }
+    
+    # 8. Collapse near-identical issues (same file, rule, message template, line)
+    with tracer.span("fingerprints"):
+        index = FingerprintIndex(fixes_data.get("project"))
+        for issue in all_issues:
+            index.add(issue)
+        
+        insights["summary"]["unique_issues"] = len(index)
+        insights["summary"]["duplicate_issues"] = index.duplicates
+        for entry in index.most_repeated(3):
+            insights["collapsed"].append(
+                f"{entry['file']}: {entry['rule']} - {entry['template']} (x{entry['count']})"
+            )
     
     # Limit insights to most important ones
     insights["patterns"] = insights["patterns"][:5]
     insights["hotspots"] = insights["hotspots"][:3]
     insights["recommendations"] = insights["recommendations"][:4]
     
-    return insights
+    return (insights, counts) if with_counts else insights
+
+def record_history(fixes_data):
+    """Append this run's issue counts to the project's history store"""
+    observer_dir = Path(fixes_data.get("project") or ".") / ".observer"
+    if not observer_dir.exists():
+        return
+    
+    try:
+        store = HistoryStore(observer_dir / "history.db")
+        store.record_issues(iter_issues(fixes_data), fixes_data.get("project"))
+        store.close()
+    except sqlite3.Error:
+        pass  # History is best effort - never block the insights output
+
+def expand_batch_paths(patterns):
+    """Expand files, directories and globs to FIX_THIS.json / fixes.json paths"""
+    paths = []
+    for pattern in patterns:
+        for match in sorted(glob.glob(os.path.expanduser(pattern), recursive=True)) or [pattern]:
+            match = Path(match)
+            if match.is_dir():
+                for candidate in (match / ".observer" / "FIX_THIS.json", match / "src" / "contracts" / "fixes.json"):
+                    if candidate.exists():
+                        match = candidate
+                        break
+                else:
+                    continue
+            if match.is_file() and match not in paths:
+                paths.append(match)
+    return paths
+
+def analyze_project(fixes_path, output_path):
+    """Batch worker: analyze one project and write its insights file
+    
+    Returns only small aggregates so results are cheap to send back
+    from the process pool. Batch mode does not record history: it only
+    reads the scanned projects and writes under --out. With tracing on, the worker's spans ride
+    along under "trace" for batch_main to merge into the parent trace.
+    """
+    with tracer.span("project", source=str(fixes_path)):
+        result = run_project(fixes_path, output_path)
+    if tracer.enabled:
+        result["trace"] = tracer.take()
+    return result
+
+def run_project(fixes_path, output_path):
+    """Analyze one project for analyze_project"""
+    try:
+        with open(fixes_path, 'r') as f:
+            fixes_data = json.load(f)
+        
+        insights, counts = analyze_patterns(fixes_data, with_counts=True)
+        write_artifact(output_path, {
+            "source": str(fixes_path),
+            "project": fixes_data.get("project"),
+            "ai_insights": insights
+        })
+        
+        # Project-relative paths so hotspots read the same for every project
+        index = FingerprintIndex(fixes_data.get("project"))
+        file_counts = Counter()
+        for file_path, count in counts["files"].items():
+            file_counts[index.normalize_file(file_path)] += count
+        
+        return {
+            "source": str(fixes_path),
+            "output": str(output_path),
+            "total_issues": sum(counts["rules"].values()),
+            "hotspots": file_counts.most_common(10),
+            "rules": dict(counts["rules"]),
+            "most_common_issue_type": insights["summary"].get("most_common_issue_type")
+        }
+    except Exception as e:
+        return {"source": str(fixes_path), "error": str(e)}
+
+def combine_results(results):
+    """Cross-project hotspot and pattern summary"""
+    analyzed = [r for r in results if "error" not in r]
+    hotspots = []
+    rule_totals = Counter()
+    rule_projects = Counter()
+    issue_types = Counter()
+    
+    for result in analyzed:
+        project = Path(result["output"]).name.replace(".insights.json", "")
+        hotspots.extend((project, file_path, count) for file_path, count in result["hotspots"])
+        rule_totals.update(result["rules"])
+        rule_projects.update(result["rules"].keys())
+        issue_types[result["most_common_issue_type"]] += 1
+    
+    return {
+        "projects_analyzed": len(analyzed),
+        "projects_failed": [{"source": r["source"], "error": r["error"]} for r in results if "error" in r],
+        "total_issues": sum(r["total_issues"] for r in analyzed),
+        "hotspots": [
+            f"{project}: {file_path} ({count} issues)"
+            for project, file_path, count in sorted(hotspots, key=lambda h: -h[2])[:10]
+        ],
+        "patterns": [
+            f"{rule}: {count} issues across {rule_projects[rule]} projects"
+            for rule, count in rule_totals.most_common(10)
+        ],
+        "most_common_issue_types": dict(issue_types.most_common())
+    }
+
+def batch_main(argv):
+    """Batch mode: analyze many projects on a process pool"""
+    parser = argparse.ArgumentParser(
+        prog="pattern-insights.py --batch",
+        description="Run pattern insights over many FIX_THIS.json / fixes.json files"
+    )
+    parser.add_argument("paths", nargs="+", help="files, project directories or globs")
+    parser.add_argument("--out", default=".observer/batch-insights", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="process pool size")
+    args = parser.parse_args(argv)
+    
+    fixes_paths = expand_batch_paths(args.paths)
+    if not fixes_paths:
+        print("No FIX_THIS.json or fixes.json files found", file=sys.stderr)
+        sys.exit(1)
+    
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    # One output file per project, named after the project directory
+    output_paths = []
+    seen = Counter()
+    for fixes_path in fixes_paths:
+        parent = fixes_path.parent
+        project_dir = parent.parent.parent if parent.name == "contracts" else parent.parent
+        name = project_dir.resolve().name or "project"
+        seen[name] += 1
+        if seen[name] > 1:
+            name = f"{name}-{seen[name]}"
+        output_paths.append(out_dir / f"{name}.insights.json")
+    
+    started = time.perf_counter()
+    with tracer.span("batch", projects=len(fixes_paths)):
+        if args.workers > 1 and len(fixes_paths) > 1:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                results = list(pool.map(analyze_project, fixes_paths, output_paths))
+        else:
+            results = [analyze_project(f, o) for f, o in zip(fixes_paths, output_paths)]
+        for result in results:
+            if "trace" in result:
+                tracer.merge(result.pop("trace"))
+    
+    combined = combine_results(results)
+    combined["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    combined_path = out_dir / "combined-insights.json"
+    write_artifact(combined_path, combined, header_keys=["projects_analyzed", "total_issues"])
+    
+    print(f"📊 Analyzed {combined['projects_analyzed']}/{len(fixes_paths)} projects "
+          f"({combined['total_issues']} issues) in {combined['duration_ms']}ms")
+    for hotspot in combined["hotspots"][:5]:
+        print(f"  • {hotspot}")
+    print(f"📁 Results saved to: {out_dir}")
+    tracer.finish()
 
 def main():
     """Main function to read fixes.json and add insights"""
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2:])
+        return
+    
     try:
         # Read from stdin (piped from TypeScript)
         input_data = sys.stdin.read()
@@ -175,14 +384,30 @@ def main():
             with open(fixes_path, 'r') as f:
                 fixes_data = json.load(f)
         
+        # Affected-only mode: insights cover just the files touched by the change
+        analysis_data = fixes_data
+        if os.environ.get("OBSERVER_AFFECTED_ONLY") == "1" or "--affected" in sys.argv[1:]:
+            affected = load_affected(Path(fixes_data.get("project") or ".") / ".observer")
+            if affected is not None:
+                analysis_data = filter_fixes(fixes_data, affected)
+        
         # Generate insights
-        insights = analyze_patterns(fixes_data)
+        started = time.perf_counter()
+        with tracer.span("analyze_patterns"):
+            insights = analyze_patterns(analysis_data)
+        if analysis_data is not fixes_data:
+            insights["scope"] = "affected"
+
+        insights["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
         
         # Add insights to the data
         fixes_data["ai_insights"] = insights
+        with tracer.span("record_history"):
+            record_history(fixes_data)
         
-        # Output the enhanced data
-        print(json.dumps(fixes_data, indent=2))
+        # Output the enhanced data (compact - the fix-file pipeline parses it, not people)
+        print(json.dumps(fixes_data, separators=(",", ":")))
+        tracer.finish()
         
     except Exception as e:
         # On error, return original data or empty insights
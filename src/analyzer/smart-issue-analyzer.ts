@@ -30,6 +30,7 @@ export class SmartIssueAnalyzer {
   // Main entry point - Enhanced with bucket classification
   async analyze(): Promise<void> {
     console.log('🔍 Starting enhanced smart issue analysis with bucket classification...');
+    const startedAt = Date.now();
     
     // 1. Detect project type and features
     this.detectProjectFeatures();
@@ -52,7 +53,7 @@ export class SmartIssueAnalyzer {
       this.hasAPI,
       this.contextDetector
     );
-    this.fixFileGenerator.generateEnhancedFixFile(buckets);
+    this.fixFileGenerator.generateEnhancedFixFile(buckets, startedAt);
     
     console.log(`✅ Enhanced analysis complete. All ${this.issues.length} issues organized by importance.`);
     console.log('📊 Bucket distribution:', buckets.map(b => `${b.name}: ${b.count}`).join(', '));
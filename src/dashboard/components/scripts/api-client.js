@@ -93,6 +93,17 @@ class APIClient {
     return this.fetchData(`pages/${pageName}`);
   }
 
+  /**
+   * Dependency graph: load the manifest, then fetch slices on demand
+   */
+  async getDependencyGraphManifest() {
+    return this.fetchData('dependency-graph');
+  }
+
+  async getDependencyGraphSlice(sliceFile) {
+    return this.fetchData(`dependency-graph/${encodeURIComponent(sliceFile)}`);
+  }
+
   /**
    * Validation APIs
    */
@@ -737,6 +737,26 @@ class Dashboard {
           res.writeHead(500, { 'Content-Type': 'application/json' });
           res.end(JSON.stringify({ error: error.message }));
         }
+      } else if (req.url === '/api/dependency-graph' || req.url?.startsWith('/api/dependency-graph/')) {
+        // Sharded dependency graph written by scripts/analyze-dependencies.py:
+        // manifest first, then only the directory/entry-point slices a view needs
+        try {
+          const graphDir = path.join(this.projectPath, '.observer', 'dependency-graph');
+          const sliceName = req.url === '/api/dependency-graph' ? 'manifest.json' : path.basename(decodeURIComponent(req.url.split('/').pop() || ''));
+          const filePath = path.join(graphDir, sliceName);
+
+          if (sliceName.endsWith('.json') && fs.existsSync(filePath)) {
+            // Slices are already JSON - send them as-is without re-parsing
+            res.writeHead(200, { 'Content-Type': 'application/json' });
+            res.end(fs.readFileSync(filePath));
+          } else {
+            res.writeHead(404, { 'Content-Type': 'application/json' });
+            res.end(JSON.stringify({ error: 'Dependency graph slice not found' }));
+          }
+        } catch (error: any) {
+          res.writeHead(500, { 'Content-Type': 'application/json' });
+          res.end(JSON.stringify({ error: error.message }));
+        }
       } else if (req.url === '/modular-fixed') {
         const modularFixedPath = path.join(__dirname, 'modular-fixed.html');
         const html = fs.readFileSync(modularFixedPath, 'utf-8');